@@ -0,0 +1,114 @@
+"""Runs the benchmark suite and compares it against a saved baseline
+
+Usage, from the repository root:
+
+    python -m benchmark.run --save benchmark/baseline.json
+    python -m benchmark.run --compare benchmark/baseline.json
+
+Comparing exits with status 1 if any benchmark got slower than the
+baseline by more than the threshold ratio.
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+from typing import Dict, List
+
+from .workloads import workload_cases
+
+# Number of timed repeats per benchmark; the fastest one is kept
+REPEATS = 5
+
+
+def run_benchmarks(pattern: str = "*") -> Dict[str, Dict[str, float | int]]:
+    """Times every benchmark whose key matches the pattern
+
+    Args:
+        pattern: shell-style pattern matched against "name[tiles]" keys
+
+    Returns:
+        Dictionary from benchmark key to its calls per repeat and the
+        fastest seconds per call
+    """
+    results = dict()
+    for name, tiles, workload in workload_cases():
+        key = "%s[%d]" % (name, tiles)
+        if not fnmatch.fnmatchcase(key, pattern):
+            continue
+        timer = timeit.Timer(workload(tiles))
+        calls, _ = timer.autorange()
+        best = min(timer.repeat(REPEATS, calls)) / calls
+        results[key] = {"calls": calls, "seconds": best}
+        print("%-36s %10.1fus" % (key, 1e6 * best), file=sys.stderr)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float | int]],
+    baseline: Dict[str, Dict[str, float | int]],
+    threshold: float,
+) -> List[str]:
+    """Finds the benchmarks that got slower than the baseline
+
+    Args:
+        results: results of this run
+        baseline: results of the baseline run
+        threshold: slowdown ratio above which a benchmark counts as regressed
+
+    Returns:
+        Description of every regressed benchmark
+    """
+    regressions = list()
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[key]["seconds"]
+        print("%-36s %6.2fx" % (key, ratio))
+        if ratio > threshold:
+            regressions.append("%s is %.2fx slower than the baseline" % (key, ratio))
+    return regressions
+
+
+def main(args: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite")
+    parser.add_argument(
+        "-k", "--pattern", default="*", help="only run benchmarks matching this"
+    )
+    parser.add_argument("--save", help="file to save the results to as a baseline")
+    parser.add_argument("--compare", help="baseline file to compare the results to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="slowdown ratio flagged as a regression",
+    )
+    options = parser.parse_args(args)
+
+    results = run_benchmarks(options.pattern)
+    if options.save is not None:
+        with open(options.save, "w") as baseline_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+    if options.compare is not None:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, options.threshold)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        return 1 if len(regressions) != 0 else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
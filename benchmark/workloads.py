@@ -0,0 +1,180 @@
+import json
+import os
+import random
+from typing import Callable, Dict, Final, List, Tuple
+
+from lib.analysis.simulator import new_bag
+from lib.shared import binary_codec
+from lib.shared.gamerules import Gamerules
+from lib.shared.internal_structures import KIND_BITS, Board, Placement
+from lib.shared.network_exchange_format import (
+    ClientRequest,
+    JsonableDecoder,
+    JsonableEncoder,
+    ServerResponse,
+)
+
+# Board sizes benchmarked, from a sparse opening up to every tile in the bag
+BOARD_SIZES: Final[List[int]] = [6, 24, 54, 108]
+
+# Builds the workload for a board size and returns the function to time
+Workload = Callable[[int], Callable[[], object]]
+
+
+def synthetic_board(tiles: int, seed: int = 0) -> Board:
+    """Builds a legal board holding the given number of permanent tiles
+
+    Tiles from a shuffled full bag are placed one at a time on a random
+    frontier cell that accepts them, so that every line on the board is
+    legal. Seeds are tried in turn until one reaches the requested size.
+
+    Args:
+        tiles: number of tiles on the board, at most 108
+        seed: first seed to try
+
+    Returns:
+        The synthetic board
+    """
+    while True:
+        board = _grow_board(tiles, random.Random(seed))
+        if len(board) == tiles:
+            return board
+        seed += 1
+
+
+def _grow_board(tiles: int, rng: random.Random) -> Board:
+    bag = [tile.as_permanent() for tile in new_bag()]
+    rng.shuffle(bag)
+    board = Board()
+    board.add_tile(Placement(bag.pop(), Board.COLUMN // 2, Board.ROW // 2))
+    while len(board) < tiles:
+        frontier = list(board.frontier())
+        rng.shuffle(frontier)
+        for index, tile in enumerate(bag):
+            spots = [
+                (x, y)
+                for x, y, allowed in frontier
+                if allowed & KIND_BITS[tile.cell_value]
+            ]
+            if len(spots) != 0:
+                board.add_tile(Placement(bag.pop(index), *rng.choice(spots)))
+                break
+        else:
+            break  # No tile left in the bag fits anywhere
+    return board
+
+
+def _copy_board(board: Board) -> Board:
+    """Rebuilds a board tile by tile, so it shares no state with the original"""
+    copy = Board()
+    for placement in board:
+        copy.add_tile(placement)
+    return copy
+
+
+def board_json_serialize(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    return board.json_serialize
+
+
+def board_json_deserialize(tiles: int) -> Callable[[], object]:
+    # Decode everything but the board itself, as JsonableDecoder would
+    # before handing the board's dictionary to json_deserialize
+    object_hook = JsonableDecoder().object_hook
+    serialized = json.loads(
+        json.dumps(synthetic_board(tiles), cls=JsonableEncoder),
+        object_hook=lambda dct: dct
+        if dct.get("type") == Board.JSONABLE_TYPE
+        else object_hook(dct),
+    )
+    return lambda: Board.json_deserialize(serialized)
+
+
+def board_eq(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    other = _copy_board(board)
+    return lambda: board == other
+
+
+def gamerules_get_lines(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    rules = Gamerules()
+    placements = list(board)
+
+    def run():
+        for placement in placements:
+            rules.get_lines(placement, board)
+
+    return run
+
+
+def gamerules_score_move(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    rules = Gamerules()
+    hand = random.Random(tiles).sample(new_bag(), 6)
+    moves = rules.legal_moves(hand, board)
+
+    def run():
+        for move in moves:
+            rules.score_move(move, board)
+
+    return run
+
+
+def decode_server_response(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    hand = random.Random(tiles).sample(new_bag(), 6)
+    payload = json.dumps(
+        ServerResponse(hand, board, 0, [0, 0], valid=True), cls=JsonableEncoder
+    )
+    return lambda: json.loads(payload, cls=JsonableDecoder)
+
+
+def decode_client_request(tiles: int) -> Callable[[], object]:
+    # Every placement holds a nested tile, so this is dominated by the hook
+    request = ClientRequest("placement", list(synthetic_board(tiles)))
+    payload = json.dumps(request, cls=JsonableEncoder)
+    return lambda: json.loads(payload, cls=JsonableDecoder)
+
+
+def decode_server_response_binary(tiles: int) -> Callable[[], object]:
+    board = synthetic_board(tiles)
+    hand = random.Random(tiles).sample(new_bag(), 6)
+    payload = binary_codec.encode(ServerResponse(hand, board, 0, [0, 0], valid=True))
+    return lambda: binary_codec.decode(payload)
+
+
+def view_render(tiles: int) -> Callable[[], object]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from lib.frontend.logic import Logic
+    from view import View
+
+    pygame.init()
+    logic = Logic()
+    logic.board = synthetic_board(tiles)
+    view = View((1000, 800), logic, interactive=False)
+    return view.update_view
+
+
+WORKLOADS: Final[Dict[str, Workload]] = {
+    "board.json_serialize": board_json_serialize,
+    "board.json_deserialize": board_json_deserialize,
+    "board.__eq__": board_eq,
+    "gamerules.get_lines": gamerules_get_lines,
+    "gamerules.score_move": gamerules_score_move,
+    "decoder.server_response": decode_server_response,
+    "decoder.server_response_binary": decode_server_response_binary,
+    "decoder.client_request": decode_client_request,
+    "view.render": view_render,
+}
+
+
+def workload_cases() -> List[Tuple[str, int, Workload]]:
+    """Every benchmarked (name, board size, workload) combination"""
+    return [
+        (name, tiles, workload)
+        for name, workload in WORKLOADS.items()
+        for tiles in BOARD_SIZES
+    ]
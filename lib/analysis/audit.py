@@ -0,0 +1,224 @@
+from typing import Iterable, List, Sequence, Tuple
+
+from ..shared.gamerules import Gamerules, MoveValidation
+from ..shared.internal_structures import Board, Placement
+from .pool import WorkerPool
+
+
+class TurnAudit:
+    """Outcome of re-validating one turn
+
+    Attributes:
+        turn: index of the turn in its game, or of the pair in its batch
+        validation: MoveValidation of the move; valid for a pass
+        score: points the move scores, 0 for a pass, None if it is illegal
+        claimed: points recorded for the turn in the log, None if unknown
+    """
+
+    __slots__ = ("__turn", "__validation", "__score", "__claimed")
+    __turn: int
+    __validation: MoveValidation
+    __score: int | None
+    __claimed: int | None
+
+    def __init__(
+        self,
+        turn: int,
+        validation: MoveValidation,
+        score: int | None,
+        claimed: int | None = None,
+    ) -> None:
+        self.__turn = turn
+        self.__validation = validation
+        self.__score = score
+        self.__claimed = claimed
+
+    @property
+    def turn(self):
+        return self.__turn
+
+    @property
+    def validation(self):
+        return self.__validation
+
+    @property
+    def score(self):
+        return self.__score
+
+    @property
+    def claimed(self):
+        return self.__claimed
+
+    @property
+    def ok(self) -> bool:
+        """Whether the move is legal and scores what the log claims"""
+        return self.__validation.valid and (
+            self.__claimed is None or self.__claimed == self.__score
+        )
+
+    def __repr__(self) -> str:
+        return "TurnAudit(%d, %r, %s, claimed=%s)" % (
+            self.__turn,
+            self.__validation,
+            self.__score,
+            self.__claimed,
+        )
+
+
+class GameAudit:
+    """Outcome of re-validating a whole game log
+
+    Attributes:
+        turns: TurnAudit of every turn, in order
+    """
+
+    __slots__ = ("__turns",)
+    __turns: List[TurnAudit]
+
+    def __init__(self, turns: List[TurnAudit]) -> None:
+        self.__turns = turns
+
+    @property
+    def turns(self):
+        return self.__turns
+
+    @property
+    def ok(self) -> bool:
+        """Whether every turn is legal and scores what the log claims"""
+        return all(turn.ok for turn in self.__turns)
+
+    @property
+    def failures(self) -> List[TurnAudit]:
+        return [turn for turn in self.__turns if not turn.ok]
+
+    def totals(self, players: int) -> List[int]:
+        """Points scored by each player, with turns taken in rotation
+
+        Args:
+            players: number of players in the game
+
+        Returns:
+            Total of the legal moves of each player, in turn order
+        """
+        totals = [0] * players
+        for turn in self.__turns:
+            if turn.score is not None:
+                totals[turn.turn % players] += turn.score
+        return totals
+
+
+def audit_moves(
+    pairs: Iterable[Tuple[Board, List[Placement]]],
+    rules: Gamerules | None = None,
+) -> List[TurnAudit]:
+    """Validates and scores independent moves
+
+    Args:
+        pairs: (board, move) pairs, each move checked against its own board
+        rules: game rules to check the moves with
+
+    Returns:
+        TurnAudit of every pair, in order
+    """
+    rules = rules or Gamerules()
+    audits = list()
+    for index, (board, move) in enumerate(pairs):
+        validation, score = rules.check_move(move, board)
+        audits.append(
+            TurnAudit(index, validation, score.total if score is not None else None)
+        )
+    return audits
+
+
+def audit_game(
+    turns: Sequence[List[Placement] | None],
+    claimed: Sequence[int | None] | None = None,
+    board: Board | None = None,
+    rules: Gamerules | None = None,
+) -> GameAudit:
+    """Replays a game log, validating and scoring every turn
+
+    The log is replayed on a single board, built without a frontier since
+    validating and scoring never query it, so placing tiles skips its
+    upkeep. Each move is validated and scored in one pass, reading its
+    lines from the board afresh. Illegal moves are recorded and not applied.
+
+    Args:
+        turns: move played on each turn, None for a pass, which scores 0
+        claimed: points recorded for each turn, None entries are not checked
+        board: board the game starts from, empty by default; it is not modified
+        rules: game rules to check the moves with
+
+    Returns:
+        GameAudit of the game
+    """
+    rules = rules or Gamerules()
+    board = (board if board is not None else Board()).fork(frontier=False)
+    audits = list()
+    for index, move in enumerate(turns):
+        claim = claimed[index] if claimed is not None else None
+        if move is None:
+            audits.append(TurnAudit(index, MoveValidation(), 0, claim))
+            continue
+        validation, score = rules.check_move(move, board)
+        if score is None:
+            audits.append(TurnAudit(index, validation, None, claim))
+            continue
+        audits.append(TurnAudit(index, validation, score.total, claim))
+        for placement in move:
+            board.add_tile(
+                Placement(
+                    placement.tile.as_permanent(),
+                    placement.x_coord,
+                    placement.y_coord,
+                )
+            )
+    return GameAudit(audits)
+
+
+class GameAuditor(WorkerPool):
+    """Audits many independent game logs, sharded across worker processes
+
+    Games are independent, so they are split evenly between the workers
+    and each worker replays its games with audit_game.
+    """
+
+    GAMES_PER_TASK: int = 16
+
+    def audit_games(
+        self,
+        games: Iterable[
+            Tuple[Sequence[List[Placement] | None], Sequence[int | None] | None]
+        ],
+    ) -> List[GameAudit]:
+        """Audits a batch of game logs
+
+        Args:
+            games: (turns, claimed) pair of every game, as taken by audit_game
+
+        Returns:
+            GameAudit of every game, in order
+        """
+        games = list(games)
+        if self.max_workers == 1 or len(games) <= 1:
+            return _audit_batch(games)
+        task_size = max(
+            1, min(GameAuditor.GAMES_PER_TASK, len(games) // self.max_workers)
+        )
+        batches = [
+            games[start : start + task_size]
+            for start in range(0, len(games), task_size)
+        ]
+        return [
+            audit
+            for batch in self.executor.map(_audit_batch, batches)
+            for audit in batch
+        ]
+
+
+def _audit_batch(
+    games: List[Tuple[Sequence[List[Placement] | None], Sequence[int | None] | None]]
+) -> List[GameAudit]:
+    """Audits a batch of games in one process, sharing one Gamerules"""
+    rules = Gamerules()
+    return [audit_game(turns, claimed, rules=rules) for turns, claimed in games]
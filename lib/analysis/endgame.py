@@ -0,0 +1,300 @@
+from collections import OrderedDict
+from enum import IntEnum
+import time
+from typing import Final, FrozenSet, List, Tuple
+
+from ..shared.gamerules import Gamerules
+from ..shared.internal_structures import Board, Placement, Tile
+
+
+class EndgameResult:
+    """Outcome of an endgame search
+
+    Attributes:
+        value: points the player to move gains minus points the opponent
+            gains from here on, if both follow the line
+        line: best line found, alternating between the two players; each
+            entry is a move, or None for a pass
+        depth: number of plies of the last completed search iteration
+        exact: whether the search reached the end of the game in every branch,
+            so value is the true outcome under perfect play
+        nodes: number of positions searched
+    """
+
+    __slots__ = ("__value", "__line", "__depth", "__exact", "__nodes")
+    __value: int
+    __line: List[List[Placement] | None]
+    __depth: int
+    __exact: bool
+    __nodes: int
+
+    def __init__(
+        self,
+        value: int,
+        line: List[List[Placement] | None],
+        depth: int,
+        exact: bool,
+        nodes: int,
+    ) -> None:
+        self.__value = value
+        self.__line = line
+        self.__depth = depth
+        self.__exact = exact
+        self.__nodes = nodes
+
+    @property
+    def value(self):
+        return self.__value
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def best_move(self):
+        """First move of the best line, None to pass or if nothing was searched"""
+        return self.__line[0] if len(self.__line) != 0 else None
+
+    @property
+    def depth(self):
+        return self.__depth
+
+    @property
+    def exact(self):
+        return self.__exact
+
+    @property
+    def nodes(self):
+        return self.__nodes
+
+    def __repr__(self) -> str:
+        return "%s%+d after %d plies (%d nodes): %s" % (
+            "" if self.__exact else "~",
+            self.__value,
+            self.__depth,
+            self.__nodes,
+            self.__line,
+        )
+
+
+class _Bound(IntEnum):
+    """Kind of value stored in the transposition table"""
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+class _SearchAborted(Exception):
+    """Raised inside the search when the node or time budget runs out"""
+
+
+class EndgameSolver:
+    """Exact two-player endgame search for when the bag is empty
+
+    With no tiles left to draw both hands are known, so the rest of the
+    game can be searched exactly. Runs negamax with alpha-beta pruning and
+    iterative deepening, orders moves by their immediate score (trying the
+    best move from the transposition table first), and stops when the node
+    or time budget runs out, returning the result of the deepest completed
+    iteration.
+
+    Game end follows the rules for an empty bag: the first player to play
+    out their hand scores a bonus of 6 and ends the game, and the game also
+    ends when both players pass in a row.
+
+    Attributes:
+        max_nodes: maximum number of positions to search, None for no limit
+        time_limit: maximum seconds to search, None for no limit
+        max_table_entries: size of the transposition table; least recently
+            used entries are evicted beyond it
+    """
+
+    FINISH_BONUS: Final[int] = 6
+    __TIME_CHECK_INTERVAL: Final[int] = 256
+    __max_nodes: int | None
+    __time_limit: float | None
+    __max_table_entries: int
+    __rules: Gamerules
+    __table: "OrderedDict[Tuple, Tuple[int, int, _Bound, bool, FrozenSet[Placement]]]"
+    __nodes: int
+    __deadline: float | None
+    __depth_limited: bool
+
+    def __init__(
+        self,
+        max_nodes: int | None = None,
+        time_limit: float | None = None,
+        max_table_entries: int = 1 << 18,
+    ) -> None:
+        self.__max_nodes = max_nodes
+        self.__time_limit = time_limit
+        self.__max_table_entries = max_table_entries
+        self.__rules = Gamerules()
+        self.__table = OrderedDict()
+
+    def solve(
+        self, board: Board, hand: List[Tile], opponent_hand: List[Tile]
+    ) -> EndgameResult:
+        """Searches for the best line for the player to move
+
+        Args:
+            board: contains the game board
+            hand: tiles in the hand of the player to move; None entries are ignored
+            opponent_hand: tiles in the opponent's hand; None entries are ignored
+
+        Returns:
+            EndgameResult of the deepest completed search iteration
+        """
+        hand = EndgameSolver.__sorted_hand(hand)
+        opponent_hand = EndgameSolver.__sorted_hand(opponent_hand)
+        self.__table.clear()
+        self.__nodes = 0
+        self.__deadline = (
+            None if self.__time_limit is None else time.monotonic() + self.__time_limit
+        )
+        result = EndgameResult(0, [], 0, False, 0)
+        # Every tile is played one per ply at worst, plus passes in between
+        max_depth = 2 * (len(hand) + len(opponent_hand)) + 2
+        for depth in range(1, max_depth + 1):
+            self.__depth_limited = False
+            try:
+                value, line = self.__negamax(
+                    board, hand, opponent_hand, False, depth, -(1 << 30), 1 << 30
+                )
+            except _SearchAborted:
+                break
+            exact = not self.__depth_limited
+            result = EndgameResult(value, line, depth, exact, self.__nodes)
+            if exact:
+                break
+        return EndgameResult(
+            result.value, result.line, result.depth, result.exact, self.__nodes
+        )
+
+    def __negamax(
+        self,
+        board: Board,
+        hand: Tuple[Tile, ...],
+        opponent_hand: Tuple[Tile, ...],
+        passed: bool,
+        depth: int,
+        alpha: int,
+        beta: int,
+    ) -> Tuple[int, List[List[Placement] | None]]:
+        """Value of the position for the player to move, with the best line"""
+        self.__count_node()
+        if depth == 0:
+            self.__depth_limited = True
+            return 0, []
+
+        key = (
+            board.fingerprint,
+            tuple(tile.cell_value for tile in hand),
+            tuple(tile.cell_value for tile in opponent_hand),
+            passed,
+        )
+        entry = self.__table.get(key)
+        best_key = None
+        if entry is not None:
+            self.__table.move_to_end(key)
+            entry_depth, entry_value, bound, entry_limited, best_key = entry
+            if entry_depth >= depth and (
+                bound == _Bound.EXACT
+                or bound == _Bound.LOWER
+                and entry_value >= beta
+                or bound == _Bound.UPPER
+                and entry_value <= alpha
+            ):
+                self.__depth_limited = self.__depth_limited or entry_limited
+                return entry_value, []
+
+        # Tracks whether this subtree alone was cut off by the depth limit
+        outer_limited = self.__depth_limited
+        self.__depth_limited = False
+
+        candidates = list()
+        for move in self.__rules.legal_moves(hand, board):
+            move_key = frozenset(move)
+            score = self.__rules.score_move(move, board)
+            candidates.append((move_key == best_key, score, move_key, move))
+        candidates.sort(key=lambda candidate: candidate[:2], reverse=True)
+
+        original_alpha = alpha
+        best_value = -(1 << 30)
+        best_line: List[List[Placement] | None] = []
+        best_key = None
+        if len(candidates) == 0:
+            if passed:  # Both players passed in a row, so the game is over
+                self.__depth_limited = outer_limited
+                return 0, [None]
+            value, line = self.__negamax(
+                board, opponent_hand, hand, True, depth - 1, -beta, -alpha
+            )
+            best_value, best_line = -value, [None] + line
+        for _, score, move_key, move in candidates:
+            remaining = list(hand)
+            for placement in move:
+                remaining.remove(placement.tile)
+            if len(remaining) == 0:
+                value, line = score + EndgameSolver.FINISH_BONUS, []
+            else:
+                child = board.fork()
+                for placement in move:
+                    child.add_tile(
+                        Placement(
+                            placement.tile.as_permanent(),
+                            placement.x_coord,
+                            placement.y_coord,
+                        )
+                    )
+                value, line = self.__negamax(
+                    child,
+                    opponent_hand,
+                    tuple(remaining),
+                    False,
+                    depth - 1,
+                    score - beta,
+                    score - alpha,
+                )
+                value = score - value
+            if value > best_value:
+                best_value, best_line, best_key = value, [move] + line, move_key
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = _Bound.UPPER
+        elif best_value >= beta:
+            bound = _Bound.LOWER
+        else:
+            bound = _Bound.EXACT
+        self.__table[key] = (depth, best_value, bound, self.__depth_limited, best_key)
+        self.__depth_limited = self.__depth_limited or outer_limited
+        self.__table.move_to_end(key)
+        if len(self.__table) > self.__max_table_entries:
+            self.__table.popitem(last=False)
+        return best_value, best_line
+
+    def __count_node(self) -> None:
+        """Counts a searched position, aborting the search once over budget"""
+        self.__nodes += 1
+        if self.__max_nodes is not None and self.__nodes > self.__max_nodes:
+            raise _SearchAborted
+        if (
+            self.__deadline is not None
+            and self.__nodes % EndgameSolver.__TIME_CHECK_INTERVAL == 0
+            and time.monotonic() > self.__deadline
+        ):
+            raise _SearchAborted
+
+    @staticmethod
+    def __sorted_hand(hand: List[Tile]) -> Tuple[Tile, ...]:
+        """Hand without empty slots, in a canonical order"""
+        return tuple(
+            sorted(
+                (tile for tile in hand if tile is not None),
+                key=lambda tile: tile.cell_value,
+            )
+        )
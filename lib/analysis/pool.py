@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+class WorkerPool:
+    """Base of the analysis tools that fan work out to worker processes
+
+    The pool of worker processes is created the first time work is sent
+    to it. Tools can be used as a context manager to shut the pool down.
+
+    Attributes:
+        max_workers: number of worker processes, 1 to work in this process
+        executor: pool of worker processes, created on first use
+    """
+
+    __max_workers: int
+    __executor: ProcessPoolExecutor | None
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        """Creates the pool without starting any process
+
+        Args:
+            max_workers: number of worker processes, defaults to the CPU count;
+                1 works in this process
+        """
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__executor = None
+
+    @property
+    def max_workers(self):
+        return self.__max_workers
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Pool of worker processes, started on first access"""
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(self.__max_workers)
+        return self.__executor
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
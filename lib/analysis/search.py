@@ -0,0 +1,157 @@
+from multiprocessing.shared_memory import SharedMemory
+import pickle
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+import uuid
+
+from ..shared.gamerules import Gamerules
+from ..shared.internal_structures import Board, Placement, Tile
+from .pool import WorkerPool
+
+
+class ScoredMove:
+    """A legal move together with its score
+
+    Attributes:
+        move: list of placements making up the move
+        score: points the move scores
+    """
+
+    __slots__ = ("__move", "__score")
+    __move: List[Placement]
+    __score: int
+
+    def __init__(self, move: List[Placement], score: int) -> None:
+        self.__move = move
+        self.__score = score
+
+    @property
+    def move(self):
+        return self.__move
+
+    @property
+    def score(self):
+        return self.__score
+
+    def sort_key(self) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """Key ordering moves by descending score, ties broken by position"""
+        return (
+            -self.__score,
+            sorted((p.x_coord, p.y_coord, p.tile.cell_value) for p in self.__move),
+        )
+
+    def __repr__(self) -> str:
+        return "%d points: %s" % (self.__score, self.__move)
+
+
+class MoveSearch(WorkerPool):
+    """Ranks every legal move for a hand, using a pool of worker processes
+
+    The frontier cells of the board are split into groups and each group
+    is searched by a worker process. The board and hand are written once
+    per search into a shared memory block; each worker unpickles them the
+    first time it sees that block and reuses them for all of its tasks,
+    so tasks only carry their list of cells.
+
+    Attributes:
+        rules: game rules used to generate and score moves
+    """
+
+    TASKS_PER_WORKER: int = 4
+    __rules: Gamerules
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        """Creates the search
+
+        Args:
+            max_workers: number of worker processes, defaults to the CPU count;
+                1 runs the search in this process
+        """
+        WorkerPool.__init__(self, max_workers)
+        self.__rules = Gamerules()
+
+    def best_moves(
+        self, hand: Iterable[Tile], board: Board, top_n: int = 1
+    ) -> List[ScoredMove]:
+        """Finds the highest scoring legal moves
+
+        Args:
+            hand: tiles in the player's hand; None entries are ignored
+            board: contains the game board
+            top_n: maximum number of moves to return
+
+        Returns:
+            Up to top_n legal moves, best first
+        """
+        tiles = [tile for tile in hand if tile is not None]
+        if len(board) == 0:
+            anchors = [(Board.COLUMN // 2, Board.ROW // 2)]
+        else:
+            anchors = [(x, y) for x, y, allowed in board.frontier() if allowed]
+        task_count = min(len(anchors), self.max_workers * MoveSearch.TASKS_PER_WORKER)
+        if self.max_workers == 1 or task_count <= 1:
+            return _rank_moves(self.__rules, tiles, board, anchors, top_n)
+
+        payload = pickle.dumps((board, tiles), pickle.HIGHEST_PROTOCOL)
+        memory = SharedMemory(create=True, size=len(payload))
+        search_id = uuid.uuid4().hex
+        try:
+            memory.buf[: len(payload)] = payload
+            futures = [
+                self.executor.submit(
+                    _search_worker,
+                    search_id,
+                    memory.name,
+                    len(payload),
+                    anchors[i::task_count],
+                    top_n,
+                )
+                for i in range(task_count)
+            ]
+            ranked: Dict[FrozenSet[Placement], ScoredMove] = dict()
+            for future in futures:
+                for scored in future.result():
+                    ranked[frozenset(scored.move)] = scored
+        finally:
+            memory.close()
+            memory.unlink()
+        return sorted(ranked.values(), key=ScoredMove.sort_key)[:top_n]
+
+
+def _rank_moves(
+    rules: Gamerules,
+    tiles: List[Tile],
+    board: Board,
+    anchors: List[Tuple[int, int]],
+    top_n: int,
+) -> List[ScoredMove]:
+    """Scores the legal moves starting at the given cells and returns the top_n"""
+    scored = [
+        ScoredMove(move, rules.score_move(move, board))
+        for move in rules.legal_moves(tiles, board, anchors)
+    ]
+    scored.sort(key=ScoredMove.sort_key)
+    return scored[:top_n]
+
+
+# Board and hand of the search this worker process last took part in
+_worker_search: Tuple[str, Gamerules, Board, List[Tile]] | None = None
+
+
+def _search_worker(
+    search_id: str,
+    memory_name: str,
+    size: int,
+    anchors: List[Tuple[int, int]],
+    top_n: int,
+) -> List[ScoredMove]:
+    """Runs one search task in a worker process"""
+    global _worker_search
+    if _worker_search is None or _worker_search[0] != search_id:
+        memory = SharedMemory(name=memory_name)
+        try:
+            board, tiles = pickle.loads(bytes(memory.buf[:size]))
+        finally:
+            memory.close()
+        _worker_search = (search_id, Gamerules(), board, tiles)
+    _, rules, board, tiles = _worker_search
+    return _rank_moves(rules, tiles, board, anchors, top_n)
@@ -0,0 +1,382 @@
+import argparse
+from contextlib import contextmanager
+import json
+import random
+import time
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+
+from ..shared.gamerules import Gamerules
+from ..shared.internal_structures import Board, Placement, Tile, TileColor, TileShape
+
+# Chooses a move from the legal moves for a hand, or None to pass
+MovePolicy = Callable[
+    [Gamerules, List[Tile], Board, random.Random], List[Placement] | None
+]
+
+
+def random_policy(
+    rules: Gamerules, hand: List[Tile], board: Board, rng: random.Random
+) -> List[Placement] | None:
+    """Plays a uniformly random legal move"""
+    moves = rules.legal_moves(hand, board)
+    return rng.choice(moves) if len(moves) != 0 else None
+
+
+def greedy_policy(
+    rules: Gamerules, hand: List[Tile], board: Board, rng: random.Random
+) -> List[Placement] | None:
+    """Plays the highest scoring legal move, breaking ties at random"""
+    best_moves: List[List[Placement]] = list()
+    best_score = 0
+    for move in rules.legal_moves(hand, board):
+        score = rules.score_move(move, board)
+        if score > best_score:
+            best_moves, best_score = [move], score
+        elif score == best_score:
+            best_moves.append(move)
+    return rng.choice(best_moves) if len(best_moves) != 0 else None
+
+
+POLICIES: Final[Dict[str, MovePolicy]] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def new_bag() -> List[Tile]:
+    """Creates the full bag of 108 tiles, three of every kind"""
+    return [
+        Tile(color, shape)
+        for _ in range(Simulator.COPIES_PER_TILE)
+        for color in TileColor
+        for shape in TileShape
+    ]
+
+
+class GameRecord:
+    """Record of one simulated game
+
+    Attributes:
+        seed: seed the game was played with
+        turns: move played on each turn, None for a turn spent swapping or passing
+        scores: final score of each player
+    """
+
+    __slots__ = ("__seed", "__turns", "__scores")
+    __seed: int
+    __turns: List[List[Placement] | None]
+    __scores: List[int]
+
+    def __init__(
+        self, seed: int, turns: List[List[Placement] | None], scores: List[int]
+    ) -> None:
+        self.__seed = seed
+        self.__turns = turns
+        self.__scores = scores
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    @property
+    def turns(self):
+        return self.__turns
+
+    @property
+    def scores(self):
+        return self.__scores
+
+    @property
+    def moves(self) -> int:
+        """Number of turns on which tiles were placed"""
+        return sum(turn is not None for turn in self.__turns)
+
+    def json_serialize(self) -> Dict:
+        return {
+            "seed": self.__seed,
+            "turns": [
+                None
+                if turn is None
+                else [placement.json_serialize() for placement in turn]
+                for turn in self.__turns
+            ],
+            "scores": self.__scores,
+        }
+
+
+class SimulationReport:
+    """Throughput of a batch of simulated games
+
+    Attributes:
+        games: number of games played
+        moves: number of moves played over all games
+        elapsed: wall time of the batch in seconds
+        timings: calls and total seconds spent in each timed step
+    """
+
+    __slots__ = ("__games", "__moves", "__elapsed", "__timings")
+    __games: int
+    __moves: int
+    __elapsed: float
+    __timings: Dict[str, Tuple[int, float]]
+
+    def __init__(
+        self,
+        games: int,
+        moves: int,
+        elapsed: float,
+        timings: Dict[str, Tuple[int, float]],
+    ) -> None:
+        self.__games = games
+        self.__moves = moves
+        self.__elapsed = elapsed
+        self.__timings = timings
+
+    @property
+    def games(self):
+        return self.__games
+
+    @property
+    def moves(self):
+        return self.__moves
+
+    @property
+    def elapsed(self):
+        return self.__elapsed
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def games_per_second(self) -> float:
+        return self.__games / self.__elapsed if self.__elapsed > 0 else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.__moves / self.__elapsed if self.__elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        lines = [
+            "%d games, %d moves in %.3fs: %.1f games/s, %.1f moves/s"
+            % (
+                self.__games,
+                self.__moves,
+                self.__elapsed,
+                self.games_per_second,
+                self.moves_per_second,
+            )
+        ]
+        for name, (calls, seconds) in sorted(
+            self.__timings.items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                "  %-12s %8d calls %9.3fs %9.1fus/call"
+                % (name, calls, seconds, 1e6 * seconds / calls if calls else 0.0)
+            )
+        return "\n".join(lines)
+
+
+class Simulator:
+    """Plays whole games headlessly through Gamerules and Board
+
+    Each game deals from a full shuffled bag. On their turn a player plays
+    the move chosen by their policy and draws back up to a full hand. A
+    player without a move swaps their whole hand if the bag holds enough
+    tiles, and passes otherwise. The game ends when a player plays out
+    their hand with the bag empty, scoring a bonus of 6, or after a full
+    round in which every player swapped or passed.
+
+    Attributes:
+        policies: move policy of each player, in turn order
+        rules: game rules used to generate, score and apply moves, timing
+            every call made to them by the simulator or the policies
+        timings: calls and total seconds spent in each timed step
+    """
+
+    HAND_SIZE: Final[int] = 6
+    COPIES_PER_TILE: Final[int] = 3
+    FINISH_BONUS: Final[int] = 6
+    __policies: List[MovePolicy]
+    __rules: "_TimedRules"
+    __timings: Dict[str, List[float]]
+
+    def __init__(self, policies: Sequence[MovePolicy]) -> None:
+        """Creates the simulator
+
+        Args:
+            policies: move policy of each player, in turn order
+        """
+        if len(policies) == 0:
+            raise ValueError("At least one player is required")
+        self.__policies = list(policies)
+        self.__timings = dict()
+        self.__rules = _TimedRules(Gamerules(), self.__timed)
+
+    @property
+    def policies(self):
+        return self.__policies
+
+    @property
+    def timings(self) -> Dict[str, Tuple[int, float]]:
+        return {
+            name: (int(calls), seconds)
+            for name, (calls, seconds) in self.__timings.items()
+        }
+
+    def play_game(self, seed: int) -> GameRecord:
+        """Plays one game
+
+        Args:
+            seed: seed of the game's shuffle and policy choices
+
+        Returns:
+            GameRecord of the game
+        """
+        rng = random.Random(seed)
+        bag = new_bag()
+        rng.shuffle(bag)
+        hands = [
+            [bag.pop() for _ in range(Simulator.HAND_SIZE)] for _ in self.__policies
+        ]
+        scores = [0] * len(self.__policies)
+        board = Board()
+        turns: List[List[Placement] | None] = list()
+        passes = 0
+        player = 0
+        while passes < len(self.__policies):
+            hand = hands[player]
+            with self.__timed("policy"):
+                move = self.__policies[player](self.__rules, hand, board, rng)
+            if move is None:
+                turns.append(None)
+                if len(bag) >= len(hand):
+                    with self.__timed("swap"):
+                        bag.extend(hand)
+                        rng.shuffle(bag)
+                        hands[player] = [bag.pop() for _ in hand]
+                # A swap does not shrink the bag, so swaps count as passes too:
+                # the game ends after a full round in which no move was played
+                passes += 1
+            else:
+                turns.append(move)
+                passes = 0
+                with self.__timed("score_move"):
+                    scores[player] += self.__rules.score_move(move, board)
+                with self.__timed("apply"):
+                    for placement in move:
+                        hand.remove(placement.tile)
+                        board.add_tile(
+                            Placement(
+                                placement.tile.as_permanent(),
+                                placement.x_coord,
+                                placement.y_coord,
+                            )
+                        )
+                    while len(hand) < Simulator.HAND_SIZE and len(bag) != 0:
+                        hand.append(bag.pop())
+                if len(hand) == 0:
+                    scores[player] += Simulator.FINISH_BONUS
+                    break
+            player = (player + 1) % len(self.__policies)
+        return GameRecord(seed, turns, scores)
+
+    def run(
+        self, games: int, seed: int = 0
+    ) -> Tuple[SimulationReport, List[GameRecord]]:
+        """Plays a batch of games with consecutive seeds
+
+        Args:
+            games: number of games to play
+            seed: seed of the first game
+
+        Returns:
+            Tuple of the SimulationReport of the batch and the GameRecord of
+            every game
+        """
+        self.__timings.clear()
+        start = time.perf_counter()
+        records = [self.play_game(seed + i) for i in range(games)]
+        elapsed = time.perf_counter() - start
+        report = SimulationReport(
+            games, sum(record.moves for record in records), elapsed, self.timings
+        )
+        return report, records
+
+    @contextmanager
+    def __timed(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the block to the named step"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing = self.__timings.setdefault(name, [0, 0.0])
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+
+
+class _TimedRules:
+    """Gamerules wrapper timing every method call under the method's name"""
+
+    __rules: Gamerules
+    __timed: Callable[[str], ContextManager[None]]
+    __methods: Dict[str, Callable]
+
+    def __init__(self, rules: Gamerules, timed: Callable[[str], ContextManager[None]]):
+        self.__rules = rules
+        self.__timed = timed
+        self.__methods = dict()
+
+    def __getattr__(self, name: str):
+        method = self.__methods.get(name)
+        if method is None:
+            target = getattr(self.__rules, name)
+
+            def method(*args, **kwargs):
+                with self.__timed(name):
+                    return target(*args, **kwargs)
+
+            self.__methods[name] = method
+        return method
+
+
+def main(args: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Plays Qwirkle games headlessly and reports throughput"
+    )
+    parser.add_argument("-g", "--games", type=int, default=100)
+    parser.add_argument("-p", "--players", type=int, default=2)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "--policy",
+        choices=sorted(POLICIES),
+        action="append",
+        help="policy of each player in turn order, repeated for the last player",
+    )
+    parser.add_argument(
+        "--corpus", help="file to write every game to, one JSON object per line"
+    )
+    options = parser.parse_args(args)
+
+    names = options.policy or ["greedy"]
+    names += [names[-1]] * (options.players - len(names))
+    simulator = Simulator([POLICIES[name] for name in names[: options.players]])
+    report, records = simulator.run(options.games, options.seed)
+    print(report)
+    if options.corpus is not None:
+        with open(options.corpus, "w") as corpus:
+            for record in records:
+                corpus.write(json.dumps(record.json_serialize()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import asyncio
+import codecs
+import json
+import re
+from typing import Final
+
+from ..shared import binary_codec
+from ..shared.framing import FrameBuffer, encode_frame
+from ..shared.network_exchange_format import JsonableEncoder
+from ..shared.network_exchange_format import JsonableDecoder
+from ..shared.network_exchange_format import ClientRequest
+from ..shared.network_exchange_format import ServerResponse
+
+
+class AsyncClientSocket:
+    """asyncio implementation of the client socket.
+
+    Offers the surface of ClientSocket without a thread per connection
+    or pygame: responses from the server are read by iterating over the
+    socket with async for, which ends once the connection is closed.
+    Many connections can be driven from a single event loop.
+
+    Attributes:
+        host: Address of the host (server)
+        port: Port number to connect to
+        framed: Whether messages are sent and received as length-prefixed
+            frames (see lib.shared.framing) rather than as bare JSON
+        codec: name of the codec negotiated for messages (see
+            lib.shared.binary_codec), JSON unless the binary codec was requested
+        transport: asyncio transport of the connection
+        protocol: asyncio protocol decoding the server's messages
+    """
+
+    __host: str
+    __port: int
+    __framed: bool
+    __transport: asyncio.Transport
+    __protocol: "_ServerResponseProtocol"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        framed: bool,
+        transport: asyncio.Transport,
+        protocol: "_ServerResponseProtocol",
+    ) -> None:
+        """Wraps an open connection, use AsyncClientSocket.connect to open one"""
+        self.__host = host
+        self.__port = port
+        self.__framed = framed
+        self.__transport = transport
+        self.__protocol = protocol
+
+    HANDSHAKE_TIMEOUT: Final[float] = 5.0
+
+    @staticmethod
+    async def connect(
+        host: str, port: int, framed: bool = False, binary: bool = False
+    ) -> "AsyncClientSocket":
+        """Connects to a server from the running event loop
+
+        Args:
+            host: Address of the host (server)
+            port: Port number to connect to
+            framed: Whether to exchange length-prefixed frames
+            binary: Whether to offer the binary codec to the server in a
+                handshake when connecting; implies framed
+
+        Returns:
+            The connected socket
+
+        Raises:
+            ConnectionError: if the handshake fails
+        """
+        framed = framed or binary
+        transport, protocol = await asyncio.get_running_loop().create_connection(
+            lambda: _ServerResponseProtocol(framed, binary), host, port
+        )
+        if binary:
+            codecs = [binary_codec.BINARY_CODEC, binary_codec.JSON_CODEC]
+            transport.write(encode_frame(binary_codec.hello(codecs)))
+            try:
+                await asyncio.wait_for(
+                    protocol.negotiated, AsyncClientSocket.HANDSHAKE_TIMEOUT
+                )
+            except (asyncio.TimeoutError, ConnectionError, ValueError) as ex:
+                transport.close()
+                raise ConnectionError("Codec handshake failed") from ex
+        return AsyncClientSocket(host, port, framed, transport, protocol)
+
+    def send_data(self, data: ClientRequest) -> None:
+        """Sends given data to the connected host.
+
+        The data is queued on the transport and written without blocking.
+
+        Args:
+            data: data to send to the host
+        """
+        if self.codec == binary_codec.BINARY_CODEC:
+            payload = binary_codec.encode(data)
+        else:
+            payload = json.dumps(data, cls=JsonableEncoder).encode()
+        self.__transport.write(encode_frame(payload) if self.__framed else payload)
+
+    async def receive(self) -> ServerResponse:
+        """Waits for the next response from the server
+
+        Returns:
+            The next response
+
+        Raises:
+            ConnectionError: if the connection closes first
+        """
+        response = await self.__protocol.responses.get()
+        if response is _ServerResponseProtocol.CLOSED:
+            # Leave the marker for any other reader waiting on the queue
+            self.__protocol.responses.put_nowait(response)
+            raise ConnectionError(
+                "Connection to %s:%d closed" % (self.__host, self.__port)
+            )
+        return response
+
+    def close(self) -> None:
+        """Closes connection with the server."""
+        self.__transport.close()
+
+    async def wait_closed(self) -> None:
+        """Waits until the connection is fully closed"""
+        await self.__protocol.closed
+
+    def __aiter__(self) -> "AsyncClientSocket":
+        return self
+
+    async def __anext__(self) -> ServerResponse:
+        try:
+            return await self.receive()
+        except ConnectionError:
+            raise StopAsyncIteration
+
+    @property
+    def closed(self) -> bool:
+        """Flag indicating status of socket"""
+        return self.__protocol.closed.done()
+
+    @property
+    def framed(self) -> bool:
+        """Whether messages are exchanged as length-prefixed frames"""
+        return self.__framed
+
+    @property
+    def codec(self) -> str:
+        """Name of the codec messages are encoded with"""
+        return self.__protocol.codec
+
+    @property
+    def address(self):
+        """Address of the host server"""
+        return self.__host
+
+    @property
+    def port(self):
+        """Port being used on host server"""
+        return self.__port
+
+
+class _ServerResponseProtocol(asyncio.Protocol):
+    """Decodes ServerResponse objects from the byte stream into a queue
+
+    In framed mode each frame holds one response. Otherwise responses
+    are bare JSON objects read back to back from the stream, which
+    copes with responses split across or coalesced into reads. The
+    nesting depth of the text received so far is tracked, so each
+    character is scanned once and a response is only decoded once its
+    closing brace has arrived. When a codec handshake is expected, the
+    first frame is the server's choice of codec, which resolves
+    negotiated. A message that cannot be decoded, or that is not a
+    ServerResponse, closes the connection.
+    """
+
+    # Put on the queue once the connection is lost
+    CLOSED: Final[object] = object()
+    # Characters changing the nesting depth, and the start of strings
+    __STRUCTURE: Final[re.Pattern] = re.compile(r'[{}\[\]"]')
+    __STRING: Final[re.Pattern] = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+    __framed: bool
+    __frames: FrameBuffer
+    __decoder: JsonableDecoder
+    __text: codecs.IncrementalDecoder
+    __pending: str
+    __scanned: int
+    __depth: int
+    __transport: asyncio.Transport | None
+    responses: "asyncio.Queue[ServerResponse | object]"
+    closed: "asyncio.Future[None]"
+    negotiated: "asyncio.Future[str]"
+    codec: str
+
+    def __init__(self, framed: bool, handshake: bool = False) -> None:
+        self.__framed = framed
+        self.__frames = FrameBuffer()
+        self.__decoder = JsonableDecoder()
+        self.__text = codecs.getincrementaldecoder("utf-8")()
+        self.__pending = ""
+        self.__scanned = 0
+        self.__depth = 0
+        self.__transport = None
+        self.responses = asyncio.Queue()
+        self.closed = asyncio.get_running_loop().create_future()
+        self.negotiated = asyncio.get_running_loop().create_future()
+        self.codec = binary_codec.JSON_CODEC
+        if not handshake:
+            self.negotiated.set_result(self.codec)
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.__transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        try:
+            if self.__framed:
+                self.__receive_frames(data)
+            else:
+                self.__receive_text(self.__text.decode(data))
+        except Exception:
+            # Well-formed JSON of the wrong shape fails in json_deserialize
+            self.__transport.close()
+
+    def __put(self, response: object) -> None:
+        """Queues a decoded message, which must be a ServerResponse"""
+        if not isinstance(response, ServerResponse):
+            raise ValueError("Expected a response, got %s" % type(response).__name__)
+        self.responses.put_nowait(response)
+
+    def __receive_frames(self, data: bytes) -> None:
+        """Decodes every complete frame received"""
+        self.__frames.feed(data)
+        for payload in self.__frames.frames():
+            if not self.negotiated.done():
+                self.__negotiate(payload)
+            elif self.codec == binary_codec.BINARY_CODEC:
+                self.__put(binary_codec.decode(payload))
+            else:
+                self.__put(self.__decoder.decode(str(payload, "utf-8")))
+
+    def __receive_text(self, text: str) -> None:
+        """Decodes every JSON object completed by the received text
+
+        Scanning resumes where the previous call stopped, skipping over
+        strings whole; a string not yet received in full is scanned again
+        from its opening quote.
+        """
+        pending = self.__pending + text
+        start = 0
+        position = self.__scanned
+        while True:
+            match = _ServerResponseProtocol.__STRUCTURE.search(pending, position)
+            if match is None:
+                position = len(pending)
+                break
+            position = match.start()
+            if match.group() == '"':
+                string = _ServerResponseProtocol.__STRING.match(pending, position)
+                if string is None:
+                    break  # Wait for the rest of the string
+                position = string.end()
+                continue
+            position += 1
+            if match.group() in "{[":
+                self.__depth += 1
+                continue
+            self.__depth -= 1
+            if self.__depth < 0:
+                raise ValueError("Unbalanced %r in response" % match.group())
+            if self.__depth == 0:
+                self.__put(self.__decoder.decode(pending[start:position]))
+                start = position
+        self.__pending = pending[start:]
+        self.__scanned = position - start
+
+    def __negotiate(self, payload: memoryview) -> None:
+        """Takes the codec chosen in the server's handshake reply"""
+        try:
+            codec = binary_codec.parse_hello(payload).get("codec")
+        except ValueError as ex:
+            self.negotiated.set_exception(ex)
+            return
+        if codec not in (binary_codec.BINARY_CODEC, binary_codec.JSON_CODEC):
+            self.negotiated.set_exception(
+                ValueError("Server chose unknown codec %r" % codec)
+            )
+            return
+        self.codec = codec
+        self.negotiated.set_result(codec)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if not self.negotiated.done():
+            self.negotiated.set_exception(
+                ConnectionError("Connection closed during handshake")
+            )
+        self.responses.put_nowait(_ServerResponseProtocol.CLOSED)
+        if not self.closed.done():
+            self.closed.set_result(None)
@@ -1,12 +1,17 @@
+from collections import deque
 import json
-from typing import Final, final, NoReturn
+from typing import Deque, Final, final, List, NoReturn
+import selectors
 import socket
+from threading import Condition
 from threading import Event
 from threading import Thread
 
 from pygame import USEREVENT
 import pygame.event
 
+from ..shared import binary_codec
+from ..shared.framing import FrameBuffer, encode_frame
 from ..shared.network_exchange_format import JsonableEncoder
 from ..shared.network_exchange_format import JsonableDecoder
 from ..shared.network_exchange_format import ClientRequest
@@ -17,6 +22,9 @@ from ..shared.network_exchange_format import ServerResponse
 class DataReceivedEvent:
     """Utility class for creating custom Pygame events when data is received.
 
+    The event carries the decoded ServerResponse itself as its response
+    attribute, so the UI reads it without it being serialized again.
+
     Do not instantiate object of this type.
     """
 
@@ -27,10 +35,7 @@ class DataReceivedEvent:
 
     @staticmethod
     def create_event(data: ServerResponse):
-        amended_data = data.json_serialize()
-        amended_data.pop("type")
-        amended_data["flag"] = ServerResponse.ResponseFlag(amended_data["flag"])
-        return pygame.event.Event(DataReceivedEvent.EVENTTYPE, amended_data)
+        return pygame.event.Event(DataReceivedEvent.EVENTTYPE, response=data)
 
 
 @final
@@ -61,51 +66,278 @@ class ClientSocket:
         port: Port number to connect to
         sock: low-level socket object connected to host
         closed: Flag indicating status of socket
+        framed: Whether messages are sent and received as length-prefixed
+            frames (see lib.shared.framing) rather than as bare JSON
+        codec: name of the codec negotiated for messages (see
+            lib.shared.binary_codec), JSON unless the binary codec was requested
+        frames: receive buffer for framed messages
+        outbound: encoded messages waiting to be written by the writer thread
+        max_queued: number of messages outbound holds before send_data
+            refuses more
+        pending: number of messages in outbound
+        wakeup_reader: end of a socket pair the listener waits on together
+            with sock, so that close() can wake it up
+        wakeup_writer: end of the socket pair close() writes to
     """
 
+    HANDSHAKE_TIMEOUT: Final[float] = 5.0
+    # Seconds the writer is given to send queued messages once closed
+    FLUSH_TIMEOUT: Final[float] = 5.0
+    MAX_QUEUED: Final[int] = 64
     __host: str
     __port: int
+    __framed: bool
+    __codec: str
+    _frames: FrameBuffer
+    __outbound: Deque[bytes]
+    __outbound_ready: Condition
+    __max_queued: int
     _sock: socket.socket
     _closed: Event
+    _wakeup_reader: socket.socket
+    __wakeup_writer: socket.socket
     __listener: "_ServerMsgListener"
+    __writer: "_ServerMsgWriter"
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        framed: bool = False,
+        binary: bool = False,
+        max_queued: int = MAX_QUEUED,
+    ) -> None:
         """Initializes the socket instance
 
         Args:
             host: Address of the host (server)
             port: Port number to connect to
+            framed: Whether to exchange length-prefixed frames, which lets
+                messages of any size and bursts of messages through intact
+            binary: Whether to offer the binary codec to the server in a
+                handshake when connecting; implies framed
+            max_queued: number of messages waiting to be sent before
+                send_data refuses more
+
+        Raises:
+            ConnectionError: if the handshake fails
         """
         self.__host = host
         self.__port = port
+        self.__framed = framed or binary
+        self.__codec = binary_codec.JSON_CODEC
+        self._frames = FrameBuffer()
+        self.__outbound = deque()
+        self.__outbound_ready = Condition()
+        self.__max_queued = max_queued
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._sock.connect((self.__host, self.__port))
-        self.__listener = ClientSocket._ServerMsgListener(self)
+        # Small requests go out at once; bursts of frames are coalesced by the writer
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if binary:
+            self.__codec = self.__handshake(
+                [binary_codec.BINARY_CODEC, binary_codec.JSON_CODEC]
+            )
         self._closed = Event()
+        self._wakeup_reader, self.__wakeup_writer = socket.socketpair()
+        # The writer is started first, as the listener joins it when it stops
+        self.__writer = ClientSocket._ServerMsgWriter(self)
+        self.__writer.start()
+        self.__listener = ClientSocket._ServerMsgListener(self)
         self.__listener.start()
 
-    def send_data(self, data: ClientRequest) -> None:
+    def send_data(self, data: ClientRequest) -> bool:
         """Sends given data to the connected host.
 
+        The data is encoded and queued for the writer thread, so the caller
+        never waits on the network.
+
         Args:
             data: data to send to the host
+
+        Returns:
+            False if the data was not queued, because max_queued messages
+                are already waiting or the socket is closed
         """
-        self._sock.send(json.dumps(data, cls=JsonableEncoder).encode())
+        if self.__codec == binary_codec.BINARY_CODEC:
+            payload = binary_codec.encode(data)
+        else:
+            payload = json.dumps(data, cls=JsonableEncoder).encode()
+        if self.__framed:
+            payload = encode_frame(payload)
+        with self.__outbound_ready:
+            if self._closed.is_set() or len(self.__outbound) >= self.__max_queued:
+                return False
+            self.__outbound.append(payload)
+            self.__outbound_ready.notify()
+        return True
+
+    def _next_batch(self) -> bytes | None:
+        """Waits for queued messages and takes them, called by the writer
+
+        Framed messages are delimited, so all of them are taken and joined
+        into one write. Bare JSON messages are taken one at a time, as the
+        server reads one message per receive.
+
+        Returns:
+            The messages to write, None once the socket is closed and every
+                message queued before has been taken
+        """
+        with self.__outbound_ready:
+            while len(self.__outbound) == 0 and not self._closed.is_set():
+                self.__outbound_ready.wait()
+            if len(self.__outbound) == 0:
+                return None
+            if not self.__framed:
+                return self.__outbound.popleft()
+            batch = b"".join(self.__outbound)
+            self.__outbound.clear()
+            return batch
+
+    def __handshake(self, codecs: List[str]) -> str:
+        """Offers codecs to the server and waits for its choice
+
+        Args:
+            codecs: names of the codecs to offer, preferred first
+
+        Returns:
+            Name of the codec the server chose
+
+        Raises:
+            ConnectionError: if the server does not reply with a valid choice
+        """
+        self._sock.settimeout(ClientSocket.HANDSHAKE_TIMEOUT)
+        try:
+            self._sock.sendall(encode_frame(binary_codec.hello(codecs)))
+            while True:
+                if self._frames.recv_into(self._sock) == 0:
+                    raise ConnectionError("Connection closed during handshake")
+                for payload in self._frames.frames():
+                    codec = binary_codec.parse_hello(payload).get("codec")
+                    if codec not in codecs:
+                        raise ConnectionError("Server chose unknown codec %r" % codec)
+                    return codec
+        except (OSError, ValueError) as ex:
+            self._sock.close()
+            raise ConnectionError("Codec handshake failed") from ex
+        finally:
+            self._sock.settimeout(None)
+
+    def _decode(self, payload: bytes | memoryview) -> ServerResponse:
+        """Decodes a message from the server with the negotiated codec
+
+        Args:
+            payload: the encoded message
+
+        Returns:
+            The decoded response
+
+        Raises:
+            ValueError: if the payload is not a valid ServerResponse
+        """
+        try:
+            if self.__codec == binary_codec.BINARY_CODEC:
+                response = binary_codec.decode(payload)
+            else:
+                response = json.loads(str(payload, "utf-8"), cls=JsonableDecoder)
+        except Exception as ex:
+            # Well-formed JSON of the wrong shape fails in json_deserialize
+            raise ValueError("Invalid message from server") from ex
+        if not isinstance(response, ServerResponse):
+            raise ValueError("Expected a response, got %s" % type(response).__name__)
+        return response
 
     def close(self) -> None:
-        """Closes connection with the server."""
-        if self._closed.is_set():
-            return
-        self._closed.set()
+        """Closes connection with the server.
+
+        Wakes the listener, which releases the socket once it has stopped
+        and the writer has sent the messages already queued.
+        """
+        with self.__outbound_ready:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+            self.__outbound_ready.notify()
+        try:
+            self.__wakeup_writer.send(b"\0")
+        except OSError:
+            pass  # The listener has already stopped
         GameEndEvent.create_connection_lost_event()
 
+    def _release(self) -> None:
+        """Closes the socket and the wakeup pair, called once by the listener
+
+        Gives the writer up to FLUSH_TIMEOUT to flush the messages queued
+        before close(); shutting the socket down fails a write still blocked.
+        """
+        self.__writer.join(ClientSocket.FLUSH_TIMEOUT)
+        try:
+            self._sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass  # The server already closed the connection
+        self._sock.close()
+        self._wakeup_reader.close()
+        self.__wakeup_writer.close()
+
     @property
     def closed(self) -> bool:
         """Flag indicating status of socket"""
         return self._closed.is_set()
 
+    @property
+    def framed(self) -> bool:
+        """Whether messages are exchanged as length-prefixed frames"""
+        return self.__framed
+
+    @property
+    def codec(self) -> str:
+        """Name of the codec messages are encoded with"""
+        return self.__codec
+
+    @property
+    def pending(self) -> int:
+        """Number of messages queued and not yet handed to the socket"""
+        return len(self.__outbound)
+
+    class _ServerMsgWriter(Thread):
+        """Writer thread sending the messages queued by send_data
+
+        In framed mode, takes every message queued since its last write and
+        sends them together; bare JSON messages are sent one by one. Writes
+        use sendall, which retries short writes until every byte is sent.
+        Stops once the socket is closed and the queue is drained, or when a
+        write fails.
+        """
+
+        __connection: "ClientSocket"
+
+        def __init__(self, connection: "ClientSocket"):
+            Thread.__init__(
+                self,
+                name="ServerMsgWriter-%s:%d" % (connection.address, connection.port),
+            )
+            self.__connection = connection
+
+        def run(self):
+            connection = self.__connection
+            while True:
+                batch = connection._next_batch()
+                if batch is None:
+                    return
+                try:
+                    connection._sock.sendall(batch)
+                except OSError:
+                    connection.close()
+                    return
+
     class _ServerMsgListener(Thread):
-        """Multithreaded socket listener implementation for client"""
+        """Multithreaded socket listener implementation for client
+
+        Blocks in a selector until the server sends data or close() writes
+        to the wakeup pair, so the thread sleeps while the connection is idle.
+        A message that cannot be decoded closes the connection, as the server
+        disconnecting does. Releases the socket exactly once, when it stops.
+        """
 
         __connection: "ClientSocket"
 
@@ -117,24 +349,74 @@ class ClientSocket:
             self.__connection = connection
 
         def run(self):
-            self.__connection._sock.settimeout(0)
-            recv_data = None
-            while not self.__connection._closed.is_set():
-                try:
-                    recv_data = self.__connection._sock.recv(4096)
-                except:
-                    pass
-                if recv_data is None:
-                    pass
-                elif len(recv_data) != 0:
-                    response = json.loads(recv_data.decode(), cls=JsonableDecoder)
+            connection = self.__connection
+            receive = (
+                self.__receive_framed if connection.framed else self.__receive_unframed
+            )
+            selector = selectors.DefaultSelector()
+            try:
+                selector.register(connection._sock, selectors.EVENT_READ)
+                selector.register(connection._wakeup_reader, selectors.EVENT_READ)
+                if connection.framed and not self.__post_frames():
+                    # Frames received along with the handshake reply
+                    connection.close()
+                # Sleeps until the server sends data or close() is called
+                while not connection._closed.is_set():
+                    for key, _ in selector.select():
+                        if key.fileobj is connection._sock and not receive():
+                            connection.close()
+            finally:
+                selector.close()
+                connection._release()
+
+        def __receive_framed(self) -> bool:
+            """Receives available data as frames
+
+            Returns:
+                False if the connection was closed by the server or a frame
+                    is not a valid message
+            """
+            try:
+                received = self.__connection._frames.recv_into(self.__connection._sock)
+            except OSError:
+                return False
+            if received == 0:
+                return False
+            return self.__post_frames()
+
+        def __post_frames(self) -> bool:
+            """Posts an event for every complete frame received
+
+            Returns:
+                False if a frame is not a valid message
+            """
+            try:
+                for payload in self.__connection._frames.frames():
+                    response = self.__connection._decode(payload)
                     pygame.event.post(DataReceivedEvent.create_event(response))
-                    recv_data = None
-                else:
-                    self.__connection.close()
-                    recv_data = None
-            self.__connection._sock.shutdown(socket.SHUT_WR)
-            self.__connection._sock.close()
+            except ValueError:
+                return False
+            return True
+
+        def __receive_unframed(self) -> bool:
+            """Receives available data as one bare JSON message
+
+            Returns:
+                False if the connection was closed by the server or the
+                    message is not valid
+            """
+            try:
+                recv_data = self.__connection._sock.recv(4096)
+            except OSError:
+                return False
+            if len(recv_data) == 0:
+                return False
+            try:
+                response = self.__connection._decode(recv_data)
+            except ValueError:
+                return False
+            pygame.event.post(DataReceivedEvent.create_event(response))
+            return True
 
     @property
     def address(self):
@@ -3,7 +3,8 @@ from typing import List
 import numpy as np
 import numpy.typing as npt
 
-from ..shared.internal_structures import Board, Placement, Tile, TileColor, TileShape
+from ..shared.internal_structures import Board, BoardDelta, Placement, Tile
+from ..shared.internal_structures import TileColor, TileShape
 from ..shared.player import Player
 from ..shared import gamerules
 from .frontend_network import ClientSocket, ClientRequest
@@ -109,27 +110,64 @@ class Logic:
         # t_hand.append(tile)
         # self.player.update_hand(t_hand)
 
-    def end_turn(self, discard: bool, client_socket: ClientSocket):
+    def end_turn(self, discard: bool, client_socket: ClientSocket) -> bool:
         """Ends the current turn
 
+        The turn stays open if the request cannot be queued for sending.
+
         Args:
             discard: keeps track of whether or not the player chose to discard this turn
-        """
-        self.__is_curr_turn = False
+            client_socket: socket connected to the server
 
+        Returns:
+            False if the request was not queued, in which case the turn is
+                unchanged and can be ended again
+        """
         if discard:
             trimmed_discard: List[Tile] = list()
             for tile in self.__discards:
                 if tile is not None:
                     trimmed_discard.append(tile)
             request = ClientRequest("discard", trimmed_discard)
-            client_socket.send_data(request)
         else:
             request = ClientRequest("placement", self.__temp_move)
-            client_socket.send_data(request)
+        if not client_socket.send_data(request):
+            return False
+        self.__is_curr_turn = False
 
         self.__discards.fill(None)
         self.__temp_move.clear()
+        return True
+
+    def update_board(self, board: Board | None, delta: BoardDelta | None) -> bool:
+        """Updates the board from a server response
+
+        Args:
+            board: full board, if the server sent one
+            delta: changes since the last board, if the server sent them
+
+        Returns:
+            False if the delta does not apply to the current board, in which
+                case the board is unchanged and a resync should be requested
+        """
+        if board is not None:
+            self.board = board
+        if delta is not None:
+            if delta.base_version != self.__board.version:
+                return False
+            self.__board.apply_delta(delta)
+        return True
+
+    def request_resync(self, client_socket: ClientSocket) -> bool:
+        """Asks the server for the full board
+
+        Args:
+            client_socket: socket connected to the server
+
+        Returns:
+            False if the request was not queued
+        """
+        return client_socket.send_data(ClientRequest("resync", []))
 
     def tile_played(self):
         """Checks if a tile has been played
@@ -0,0 +1,314 @@
+from enum import IntEnum
+import json
+import struct
+from typing import Any, Dict, Final, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .internal_structures import Board, BoardDelta, Placement, Tile
+from .network_exchange_format import ClientRequest, ServerResponse
+
+# Names of the codecs a connection can negotiate, in order of preference
+BINARY_CODEC: Final[str] = "binary/1"
+JSON_CODEC: Final[str] = "json"
+HELLO_TYPE: Final[str] = "hello"
+
+
+class MessageType(IntEnum):
+    """Tag in the first byte of every binary message"""
+
+    TILE = 1
+    PLACEMENT = 2
+    BOARD = 3
+    BOARD_DELTA = 4
+    REQUEST = 5
+    RESPONSE = 6
+
+
+# Placement: cell byte, x, y
+_PLACEMENT: Final[struct.Struct] = struct.Struct("!Bii")
+# Board: version, number of tiles
+_BOARD: Final[struct.Struct] = struct.Struct("!II")
+# Delta: base version, version, number of placed and removed cells
+_DELTA: Final[struct.Struct] = struct.Struct("!IIII")
+# Request: request type, number of items
+_REQUEST: Final[struct.Struct] = struct.Struct("!BH")
+# Response: flag, user id, hand size, number of scores, board / delta present
+_RESPONSE: Final[struct.Struct] = struct.Struct("!BiBBB")
+_HAS_BOARD: Final[int] = 0b01
+_HAS_DELTA: Final[int] = 0b10
+_REQUEST_TYPES: Final[List[str]] = ["discard", "placement", "resync"]
+_COORDINATE: Final[np.dtype] = np.dtype(">i4")
+_SCORE: Final[np.dtype] = np.dtype(">i4")
+
+
+def encode(obj: Tile | Placement | Board | BoardDelta | ClientRequest | ServerResponse):
+    """Encodes an object in the binary wire format
+
+    Tiles are their cell byte, placements a packed (cell, x, y) struct,
+    and boards parallel arrays of x, y and cell bytes. Responses have a
+    fixed header followed by the hand, scores and board.
+
+    Args:
+        obj: object to encode
+
+    Returns:
+        The encoded bytes, starting with the MessageType of the object
+
+    Raises:
+        TypeError: if the object has no binary form
+    """
+    if isinstance(obj, Tile):
+        return bytes((MessageType.TILE, obj.cell_value))
+    if isinstance(obj, Placement):
+        return bytes((MessageType.PLACEMENT,)) + _PLACEMENT.pack(
+            obj.tile.cell_value, obj.x_coord, obj.y_coord
+        )
+    if isinstance(obj, Board):
+        return bytes((MessageType.BOARD,)) + _pack_board(obj)
+    if isinstance(obj, BoardDelta):
+        return bytes((MessageType.BOARD_DELTA,)) + _pack_delta(obj)
+    if isinstance(obj, ClientRequest):
+        return bytes((MessageType.REQUEST,)) + _pack_request(obj)
+    if isinstance(obj, ServerResponse):
+        return bytes((MessageType.RESPONSE,)) + _pack_response(obj)
+    raise TypeError("Cannot encode %s" % type(obj).__name__)
+
+
+def decode(data: bytes | memoryview):
+    """Decodes an object from the binary wire format
+
+    Args:
+        data: bytes of exactly one encoded object
+
+    Returns:
+        The decoded object
+
+    Raises:
+        ValueError: if the data is not a valid encoded object
+    """
+    data = memoryview(data)
+    if len(data) == 0:
+        raise ValueError("Empty message")
+    try:
+        tag = MessageType(data[0])
+        if tag == MessageType.TILE:
+            obj, offset = _unpack_tile(data[1]), 2
+        elif tag == MessageType.PLACEMENT:
+            obj, offset = _unpack_placement(data, 1)
+        elif tag == MessageType.BOARD:
+            obj, offset = _unpack_board(data, 1)
+        elif tag == MessageType.BOARD_DELTA:
+            obj, offset = _unpack_delta(data, 1)
+        elif tag == MessageType.REQUEST:
+            obj, offset = _unpack_request(data, 1)
+        else:
+            obj, offset = _unpack_response(data, 1)
+    except (struct.error, IndexError) as ex:
+        raise ValueError("Truncated message") from ex
+    if offset != len(data):
+        raise ValueError("%d trailing bytes in message" % (len(data) - offset))
+    return obj
+
+
+def hello(codecs: Sequence[str]) -> bytes:
+    """Handshake message offering codecs to the server, sent as JSON
+
+    Args:
+        codecs: names of the codecs the client supports, preferred first
+
+    Returns:
+        The encoded hello message
+    """
+    return json.dumps({"type": HELLO_TYPE, "codecs": list(codecs)}).encode()
+
+
+def hello_reply(offered: Sequence[str], supported: Iterable[str]) -> bytes:
+    """Handshake reply choosing the first offered codec that is supported
+
+    Args:
+        offered: codecs offered in the client's hello
+        supported: codecs the server supports
+
+    Returns:
+        The encoded reply, choosing JSON if no offered codec is supported
+    """
+    supported = set(supported)
+    codec = next((codec for codec in offered if codec in supported), JSON_CODEC)
+    return json.dumps({"type": HELLO_TYPE, "codec": codec}).encode()
+
+
+def parse_hello(payload: bytes | memoryview) -> Dict[str, Any]:
+    """Decodes a hello message or reply
+
+    Args:
+        payload: the encoded message
+
+    Returns:
+        The message's dictionary
+
+    Raises:
+        ValueError: if the payload is not a hello message
+    """
+    message = json.loads(str(payload, "utf-8"))
+    if type(message) is not dict or message.get("type") != HELLO_TYPE:
+        raise ValueError("Expected a hello message")
+    return message
+
+
+def _pack_cells(cells: Sequence[Tuple[int, int, int]]) -> bytes:
+    """Packs (x, y, cell) triples as arrays of x, y and cell bytes"""
+    if len(cells) == 0:
+        return b""
+    columns = np.array(cells, np.int64).T
+    return (
+        columns[0].astype(_COORDINATE).tobytes()
+        + columns[1].astype(_COORDINATE).tobytes()
+        + columns[2].astype(np.uint8).tobytes()
+    )
+
+
+def _unpack_arrays(
+    data: memoryview, offset: int, count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Reads the x, y and cell arrays packed by _pack_cells without copying"""
+    size = count * (2 * _COORDINATE.itemsize + 1)
+    if offset + size > len(data):
+        raise ValueError("Truncated message")
+    xs = np.frombuffer(data, _COORDINATE, count, offset)
+    ys = np.frombuffer(data, _COORDINATE, count, offset + count * 4)
+    cells = np.frombuffer(data, np.uint8, count, offset + count * 8)
+    return xs, ys, cells, offset + size
+
+
+def _unpack_cells(
+    data: memoryview, offset: int, count: int
+) -> Tuple[List[Tuple[int, int, int]], int]:
+    """Unpacks count (x, y, cell) triples packed by _pack_cells"""
+    xs, ys, cells, offset = _unpack_arrays(data, offset, count)
+    return list(zip(xs.tolist(), ys.tolist(), cells.tolist())), offset
+
+
+def _unpack_tile(cell: int) -> Tile:
+    tile = Tile.from_cell(cell)
+    if tile is None:
+        raise ValueError("Invalid tile byte: %#x" % cell)
+    return tile
+
+
+def _placements(cells: List[Tuple[int, int, int]]) -> List[Placement]:
+    return [Placement(_unpack_tile(cell), x, y) for x, y, cell in cells]
+
+
+def _unpack_placement(data: memoryview, offset: int) -> Tuple[Placement, int]:
+    cell, x, y = _PLACEMENT.unpack_from(data, offset)
+    return Placement(_unpack_tile(cell), x, y), offset + _PLACEMENT.size
+
+
+def _pack_board(board: Board) -> bytes:
+    cells = list(board.cells())
+    return _BOARD.pack(board.version, len(cells)) + _pack_cells(cells)
+
+
+def _unpack_board(data: memoryview, offset: int) -> Tuple[Board, int]:
+    version, count = _BOARD.unpack_from(data, offset)
+    xs, ys, cells, offset = _unpack_arrays(data, offset + _BOARD.size, count)
+    return Board.from_arrays(xs, ys, cells, version), offset
+
+
+def _pack_delta(delta: BoardDelta) -> bytes:
+    placed = [
+        (placement.x_coord, placement.y_coord, placement.tile.cell_value)
+        for placement in delta.placed
+    ]
+    removed = np.array(delta.removed, np.int64).reshape(-1, 2).T
+    return (
+        _DELTA.pack(delta.base_version, delta.version, len(placed), len(delta.removed))
+        + _pack_cells(placed)
+        + removed[0].astype(_COORDINATE).tobytes()
+        + removed[1].astype(_COORDINATE).tobytes()
+    )
+
+
+def _unpack_delta(data: memoryview, offset: int) -> Tuple[BoardDelta, int]:
+    base_version, version, placed_count, removed_count = _DELTA.unpack_from(
+        data, offset
+    )
+    placed, offset = _unpack_cells(data, offset + _DELTA.size, placed_count)
+    if offset + removed_count * 8 > len(data):
+        raise ValueError("Truncated message")
+    xs = np.frombuffer(data, _COORDINATE, removed_count, offset)
+    ys = np.frombuffer(data, _COORDINATE, removed_count, offset + removed_count * 4)
+    removed = list(zip(xs.tolist(), ys.tolist()))
+    return (
+        BoardDelta(base_version, version, _placements(placed), removed),
+        offset + removed_count * 8,
+    )
+
+
+def _pack_request(request: ClientRequest) -> bytes:
+    items = list(request)
+    header = _REQUEST.pack(_REQUEST_TYPES.index(request.request_type), len(items))
+    if request.request_type == "placement":
+        return header + _pack_cells(
+            [(item.x_coord, item.y_coord, item.tile.cell_value) for item in items]
+        )
+    return header + bytes(item.cell_value for item in items)
+
+
+def _unpack_request(data: memoryview, offset: int) -> Tuple[ClientRequest, int]:
+    code, count = _REQUEST.unpack_from(data, offset)
+    offset += _REQUEST.size
+    if code >= len(_REQUEST_TYPES):
+        raise ValueError("Invalid request type: %d" % code)
+    request_type = _REQUEST_TYPES[code]
+    if request_type == "placement":
+        cells, offset = _unpack_cells(data, offset, count)
+        return ClientRequest(request_type, _placements(cells)), offset
+    if offset + count > len(data):
+        raise ValueError("Truncated message")
+    tiles = [_unpack_tile(cell) for cell in data[offset : offset + count]]
+    return ClientRequest(request_type, tiles), offset + count
+
+
+def _pack_response(response: ServerResponse) -> bytes:
+    hand = response.curr_hand
+    scores = response.scores
+    board = response.curr_board
+    delta = response.delta
+    parts = (_HAS_BOARD if board is not None else 0) | (
+        _HAS_DELTA if delta is not None else 0
+    )
+    packed = [
+        _RESPONSE.pack(response.flag, response.user_id, len(hand), len(scores), parts),
+        bytes(0 if tile is None else tile.cell_value for tile in hand),
+        np.array(scores, _SCORE).tobytes(),
+    ]
+    if board is not None:
+        packed.append(_pack_board(board))
+    if delta is not None:
+        packed.append(_pack_delta(delta))
+    return b"".join(packed)
+
+
+def _unpack_response(data: memoryview, offset: int) -> Tuple[ServerResponse, int]:
+    flag, user_id, hand_size, score_count, parts = _RESPONSE.unpack_from(data, offset)
+    offset += _RESPONSE.size
+    if offset + hand_size + score_count * _SCORE.itemsize > len(data):
+        raise ValueError("Truncated message")
+    hand = [
+        None if cell == 0 else _unpack_tile(cell)
+        for cell in data[offset : offset + hand_size]
+    ]
+    offset += hand_size
+    scores = np.frombuffer(data, _SCORE, score_count, offset).tolist()
+    offset += score_count * _SCORE.itemsize
+    board = delta = None
+    if parts & _HAS_BOARD:
+        board, offset = _unpack_board(data, offset)
+    if parts & _HAS_DELTA:
+        delta, offset = _unpack_delta(data, offset)
+    return (
+        ServerResponse(hand, board, user_id, scores, flag=flag, delta=delta),
+        offset,
+    )
@@ -0,0 +1,141 @@
+import socket
+import struct
+from typing import Final, Iterator
+
+
+# Frame header: payload length as an unsigned 32-bit big-endian integer
+HEADER: Final[struct.Struct] = struct.Struct("!I")
+
+
+class FrameError(ValueError):
+    """Raised when a frame header announces a payload larger than allowed"""
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefixes a payload with its length
+
+    Args:
+        payload: bytes to send as one frame
+
+    Returns:
+        The frame, header followed by payload
+    """
+    return HEADER.pack(len(payload)) + payload
+
+
+class FrameBuffer:
+    """Growable receive buffer splitting a byte stream into frames
+
+    Bytes are received straight into the free space at the end of the
+    buffer with recv_into, and complete frames are handed out as
+    memoryview slices of it, so a payload is never copied before it is
+    decoded. Consumed bytes are reclaimed by moving the unconsumed tail
+    to the front before the next receive; the buffer only grows when a
+    single frame does not fit.
+
+    Attributes:
+        buffer: receive buffer
+        start: offset of the first unconsumed byte
+        end: offset just past the last received byte
+        max_frame_size: largest payload accepted, in bytes
+    """
+
+    DEFAULT_SIZE: Final[int] = 4096
+    MAX_FRAME_SIZE: Final[int] = 1 << 24
+    __buffer: bytearray
+    __start: int
+    __end: int
+    __max_frame_size: int
+
+    def __init__(
+        self, size: int = DEFAULT_SIZE, max_frame_size: int = MAX_FRAME_SIZE
+    ) -> None:
+        """Creates an empty buffer
+
+        Args:
+            size: initial capacity in bytes
+            max_frame_size: largest payload accepted, in bytes
+        """
+        self.__buffer = bytearray(size)
+        self.__start = 0
+        self.__end = 0
+        self.__max_frame_size = max_frame_size
+
+    def recv_into(self, sock: socket.socket) -> int:
+        """Receives available bytes from a socket into the buffer
+
+        Args:
+            sock: socket to receive from
+
+        Returns:
+            Number of bytes received, 0 if the peer closed the connection
+        """
+        self.__reserve(FrameBuffer.DEFAULT_SIZE)
+        with memoryview(self.__buffer) as view, view[self.__end :] as free:
+            received = sock.recv_into(free)
+        self.__end += received
+        return received
+
+    def feed(self, data: bytes) -> None:
+        """Appends bytes received by other means to the buffer
+
+        Args:
+            data: bytes to append
+        """
+        self.__reserve(len(data))
+        self.__buffer[self.__end : self.__end + len(data)] = data
+        self.__end += len(data)
+
+    def frames(self) -> Iterator[memoryview]:
+        """Iterates over the complete frames in the buffer
+
+        Each payload is a memoryview into the buffer, valid only until the
+        iterator advances; copy it to keep it longer.
+
+        Returns:
+            Iterator of frame payloads, in order
+
+        Raises:
+            FrameError: if a frame is larger than max_frame_size
+        """
+        while self.__end - self.__start >= HEADER.size:
+            (size,) = HEADER.unpack_from(self.__buffer, self.__start)
+            if size > self.__max_frame_size:
+                raise FrameError(
+                    "Frame of %d bytes exceeds limit of %d"
+                    % (size, self.__max_frame_size)
+                )
+            begin = self.__start + HEADER.size
+            if self.__end - begin < size:
+                # Make room for the rest of the frame in one go
+                self.__reserve(size - (self.__end - begin))
+                break
+            self.__start = begin + size
+            with memoryview(self.__buffer) as view, view[
+                begin : begin + size
+            ] as payload:
+                yield payload
+        if self.__start == self.__end:
+            self.__start = self.__end = 0
+
+    def __len__(self) -> int:
+        """Number of received bytes not yet handed out as frames"""
+        return self.__end - self.__start
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer)
+
+    def __reserve(self, free: int) -> None:
+        """Makes room for at least the given number of bytes after the data"""
+        if len(self.__buffer) - self.__end >= free:
+            return
+        pending = self.__end - self.__start
+        if self.__start != 0:
+            self.__buffer[:pending] = self.__buffer[self.__start : self.__end]
+            self.__start, self.__end = 0, pending
+        if len(self.__buffer) - self.__end < free:
+            capacity = len(self.__buffer)
+            while capacity - self.__end < free:
+                capacity *= 2
+            self.__buffer.extend(bytes(capacity - len(self.__buffer)))
@@ -1,6 +1,128 @@
-from typing import List
+from enum import IntEnum
+from typing import Dict, FrozenSet, Final, Iterable, Iterator, List, Tuple
 
 from .internal_structures import Placement, Board, Tile
+from .internal_structures import ALL_KINDS, KIND_BITS
+from .lines import Line, LineMask, extract_line, extract_lines
+
+
+class MoveError(IntEnum):
+    """
+    Set of constants defining why a move is illegal
+    """
+
+    EMPTY = 1
+    TOO_MANY_TILES = 2
+    OCCUPIED = 3
+    NOT_IN_LINE = 4
+    NOT_CONTIGUOUS = 5
+    LINE_TOO_LONG = 6
+    DUPLICATE_TILE = 7
+    MISMATCHED_TILE = 8
+    NOT_CONNECTED = 9
+
+
+class MoveValidation:
+    """Result of validating a move
+
+    Evaluates to True if the move is legal.
+
+    Attributes:
+        reason: why the move is illegal, None if it is legal
+        placement: placement at which the problem was found, if any
+    """
+
+    __slots__ = ("__reason", "__placement")
+    __reason: MoveError | None
+    __placement: Placement | None
+
+    def __init__(
+        self, reason: MoveError | None = None, placement: Placement | None = None
+    ) -> None:
+        self.__reason = reason
+        self.__placement = placement
+
+    @property
+    def reason(self):
+        return self.__reason
+
+    @property
+    def placement(self):
+        return self.__placement
+
+    @property
+    def valid(self):
+        return self.__reason is None
+
+    def __bool__(self) -> bool:
+        return self.__reason is None
+
+    def __repr__(self) -> str:
+        if self.__reason is None:
+            return "Valid move"
+        if self.__placement is None:
+            return "Invalid move: %s" % (self.__reason.name)
+        return "Invalid move: %s at %s" % (self.__reason.name, self.__placement)
+
+
+class LineScore:
+    """Score of one line formed by a move
+
+    Attributes:
+        line: the scored line, including the move's tiles
+        points: points scored for the line, including any Quirkle bonus
+        qwirkle: whether the line is a completed line of six tiles
+    """
+
+    QWIRKLE_BONUS: Final[int] = 6
+    __slots__ = ("__line",)
+    __line: Line
+
+    def __init__(self, line: Line) -> None:
+        self.__line = line
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def qwirkle(self):
+        return len(self.__line.run) == Line.MAX_LENGTH
+
+    @property
+    def points(self):
+        if self.qwirkle:
+            return Line.MAX_LENGTH + LineScore.QWIRKLE_BONUS
+        return len(self.__line.run)
+
+    def __repr__(self) -> str:
+        return "%d points for %s" % (self.points, self.__line)
+
+
+class MoveScore:
+    """Line by line score of a move
+
+    Attributes:
+        lines: scores of each line the move formed or extended
+        total: total score of the move
+    """
+
+    __slots__ = ("__lines",)
+    __lines: List[LineScore]
+
+    def __init__(self, lines: List[LineScore]) -> None:
+        self.__lines = lines
+
+    @property
+    def lines(self):
+        return self.__lines
+
+    @property
+    def total(self):
+        return sum(line.points for line in self.__lines)
+
+    def __repr__(self) -> str:
+        return "%d points: %s" % (self.total, self.__lines)
 
 
 class Gamerules:
@@ -26,132 +148,223 @@ class Gamerules:
             A boolean list corresponding to the validity of the move, true if the move is
                 determined to be legal, false if it is not.
         """
+        return self.validate_move(move, board).valid
+
+    def validate_move(self, move: List[Placement], board: Board) -> MoveValidation:
+        """Validates a whole move in one pass
+
+        Finds the line shared by all placements of the move once, checks that
+        the move fills a contiguous part of it, then checks that line and the
+        line perpendicular to it at each placement. Placements whose tile is
+        already on the board as a temporary tile are accepted.
+
+        Args:
+            move: A list of placements containing a tile and it's given indices
+                to represent the most recent move.
+            board: contains the game board
+
+        Returns:
+            MoveValidation holding the reason the move is illegal, if it is.
+        """
+        return self.__move_lines(move, board)[0]
+
+    def __move_lines(self, move: List[Placement], board: Board):
+        """Finds and checks every line formed by a move
+
+        Returns:
+            Tuple of the MoveValidation of the move and, if it is legal, a list
+                of (line, placement) pairs: the main line followed by the line
+                perpendicular to it through each placement. Lines include the
+                move's tiles and skip the cell of the placement paired with them.
+        """
+        if len(move) == 0:
+            return MoveValidation(MoveError.EMPTY), None
+        if len(move) > Line.MAX_LENGTH:
+            return MoveValidation(MoveError.TOO_MANY_TILES), None
+
+        # Lines are read straight from the cells, so the overlay needs no frontier
+        overlay = board.fork(frontier=False)
+        positions = set()
         for placement in move:
-            if self.verify_placement(placement, board) is False:
-                return False
+            position = (placement.x_coord, placement.y_coord)
+            current = board.get_tile(*position)
+            if position in positions or not (
+                current is None or current is placement.tile and current.is_temporary()
+            ):
+                return MoveValidation(MoveError.OCCUPIED, placement), None
+            positions.add(position)
+            overlay.add_tile(placement)
+
+        first = move[0]
+        if all(placement.y_coord == first.y_coord for placement in move):
+            horizontal = True
+        elif all(placement.x_coord == first.x_coord for placement in move):
+            horizontal = False
+        else:
+            return MoveValidation(MoveError.NOT_IN_LINE), None
+
+        main_line = extract_line(first.x_coord, first.y_coord, overlay, horizontal)
+        if main_line is None:
+            return MoveValidation(MoveError.LINE_TOO_LONG, first), None
+        start = main_line.start[0] if horizontal else main_line.start[1]
+        for placement in move:
+            offset = (placement.x_coord if horizontal else placement.y_coord) - start
+            if not 0 <= offset < len(main_line.run):
+                return MoveValidation(MoveError.NOT_CONTIGUOUS, placement), None
+
+        connected = len(main_line.run) > len(move)
+        lines = [(main_line, first)]
+        for placement in move:
+            line = extract_line(
+                placement.x_coord, placement.y_coord, overlay, not horizontal
+            )
+            if line is None:
+                return MoveValidation(MoveError.LINE_TOO_LONG, placement), None
+            connected = connected or len(line) > 0
+            lines.append((line, placement))
+
+        for line, placement in lines:
+            if len(line) == 0:
+                continue
+            mask = LineMask.from_cells(line.run.tolist())
+            if not mask.valid:
+                if mask.kinds.bit_count() < mask.length:
+                    return MoveValidation(MoveError.DUPLICATE_TILE, placement), None
+                return MoveValidation(MoveError.MISMATCHED_TILE, placement), None
+
+        if not connected and len(overlay) > len(move):
+            return MoveValidation(MoveError.NOT_CONNECTED), None
+        return MoveValidation(), lines
+
+    def legal_moves(
+        self,
+        hand: Iterable[Tile],
+        board: Board,
+        anchors: Iterable[Tuple[int, int]] | None = None,
+    ) -> List[List[Placement]]:
+        """Enumerates every legal move that can be made with a hand
+
+        Moves are grown from the board's frontier: a move starts with a tile
+        that the frontier accepts at some cell, and is extended one tile at a
+        time at either end of its line while the frontier of the board with the
+        move so far accepts the next tile. Only cells on the board's perimeter
+        are ever visited. On an empty board moves start at the board's centre.
 
-        return True
+        Args:
+            hand: tiles in the player's hand, for ex. Player.get_hand(); None
+                entries are ignored
+            board: contains the game board
+            anchors: if given, only moves whose first tile is placed at one of
+                these (x, y) cells are generated; cells that are not on the
+                frontier are ignored
+
+        Returns:
+            List of distinct legal moves, each a list of placements in the order
+                the move was grown.
+        """
+        tiles = [tile for tile in hand if tile is not None]
+        if len(board) == 0:
+            frontier = {(Board.COLUMN // 2, Board.ROW // 2): ALL_KINDS}
+        else:
+            frontier = {(x, y): allowed for x, y, allowed in board.frontier()}
+        if anchors is not None:
+            frontier = {cell: frontier[cell] for cell in anchors if cell in frontier}
+        moves: Dict[FrozenSet[Placement], List[Placement]] = dict()
+        for (x, y), allowed in frontier.items():
+            for index, tile in Gamerules.__distinct_tiles(tiles):
+                if not allowed & KIND_BITS[tile.cell_value]:
+                    continue
+                placement = Placement(tile, x, y)
+                moves[frozenset((placement,))] = [placement]
+                extended_board = board.fork()
+                extended_board.add_tile(placement)
+                remaining = tiles[:index] + tiles[index + 1 :]
+                for horizontal in (True, False):
+                    self.__extend_move(
+                        [placement], remaining, extended_board, horizontal, moves
+                    )
+        return list(moves.values())
+
+    def __extend_move(
+        self,
+        move: List[Placement],
+        tiles: List[Tile],
+        board: Board,
+        horizontal: bool,
+        moves: Dict[FrozenSet[Placement], List[Placement]],
+    ) -> None:
+        """Adds every legal extension of a move along one axis to moves
+
+        Args:
+            move: the move so far, whose tiles are already on board
+            tiles: tiles left in the hand
+            board: contains the game board with the move placed on it
+            horizontal: axis along which the move is extended
+            moves: legal moves found so far, keyed by their set of placements
+        """
+        if len(tiles) == 0 or len(move) == Line.MAX_LENGTH:
+            return
+        dx, dy = (1, 0) if horizontal else (0, 1)
+        for step in (1, -1):
+            x = move[0].x_coord + dx * step
+            y = move[0].y_coord + dy * step
+            while (x, y) in board:
+                x += dx * step
+                y += dy * step
+            allowed = board.allowed_kinds(x, y)
+            for index, tile in Gamerules.__distinct_tiles(tiles):
+                if not allowed & KIND_BITS[tile.cell_value]:
+                    continue
+                placement = Placement(tile, x, y)
+                extended_move = move + [placement]
+                key = frozenset(extended_move)
+                if (
+                    key in moves
+                ):  # Reached before by placing the same tiles in another order
+                    continue
+                moves[key] = extended_move
+                extended_board = board.fork()
+                extended_board.add_tile(placement)
+                self.__extend_move(
+                    extended_move,
+                    tiles[:index] + tiles[index + 1 :],
+                    extended_board,
+                    horizontal,
+                    moves,
+                )
+
+    @staticmethod
+    def __distinct_tiles(tiles: List[Tile]) -> Iterator[Tuple[int, Tile]]:
+        """Iterates over the first occurrence of each tile as (index, tile)"""
+        seen = set()
+        for index, tile in enumerate(tiles):
+            if tile not in seen:
+                seen.add(tile)
+                yield index, tile
 
     def get_lines(self, placement: Placement, board: Board):
         """Check which lines a given placement could be a part of
 
-        Interated through the board from the placement data to see what valid lines configurations
-        could be made.
+        Extracts the row and column runs through the placement from the board
+        and checks the placed tile against the bitmask summary of each line.
 
         Args:
             placement: placement data of the tile
-            board: 2d array containing all placement data
+            board: contains the game board
 
         Returns:
-            A list of possible lines in form of a list of placements for ex:
-                {Line:((Tile: red, circle, x, y), (Tile: red, square, x, y), (Tile: red, star, x, y)), Line:(Tile: green, square, Tile: red, square)}
+            A tuple of the horizontal and vertical line, each a Line view that can be
+                iterated as placements, for ex:
+                (Line((Tile: red, circle, x, y), (Tile: red, square, x, y)), Line(...))
             max line length is 5, does not include current placement
-            returns None in a list that contains an invalid line
+            a line is None if it is invalid for the placed tile
         """
-        x_line = list()
-        y_line = list()
-        y_count = 0
-        x_count = 0
-        skip = False
-        for i in range(5):  # Checks up to 5 tiles above the horizontal
-            if placement.y_coord + i + 1 > 217:
-                break
-            temp_tile = board[placement.x_coord][placement.y_coord + i + 1]
-            temp_placement = Placement(
-                temp_tile, placement.x_coord, placement.y_coord + i + 1
-            )
-            if temp_tile is None:
-                break
-            else:
-                if (
-                    temp_tile.shape == placement.tile.shape
-                    or temp_tile.color == placement.tile.color
-                ):
-                    y_line.append(temp_placement)
-                    y_count += 1
-                else:  # If the line contains an invalid match
-                    y_line = None
-                    break
-            if temp_tile == placement.tile:
-                y_line = None
-                skip = True
-
-        if (
-            not skip
-        ):  # If the y_line has a duplicate skip checking below as it is invalid placement
-            for i in range(5):  # Checks up to 5 tiles below the horizontal
-                if placement.y_coord - i - 1 < 0:
-                    break
-                temp_tile = board[placement.x_coord][placement.y_coord - i - 1]
-                temp_placement = Placement(
-                    temp_tile, placement.x_coord, placement.y_coord - i - 1
-                )
-                if temp_tile is None:
-                    break
-                else:
-                    if (
-                        temp_tile.shape == placement.tile.shape
-                        or temp_tile.color == placement.tile.color
-                    ):
-                        y_line.append(temp_placement)
-                        y_count += 1
-                    else:  # If the line contains an invalid match
-                        y_line = None
-                        break
-                # Checks if line is too long or contains duplicate tiles
-                if y_count > 5 or temp_tile == placement.tile:
-                    y_line = None
-                    break
-
-        # Gets the x_line
-        for i in range(5):  # Checks up to 5 tiles to the right of the vertical
-            if placement.x_coord - i - 1 < 0:
-                break
-            temp_tile = board[placement.x_coord - i - 1][placement.y_coord]
-            temp_placement = Placement(
-                temp_tile, placement.x_coord - i - 1, placement.y_coord
-            )
-            if temp_tile is None:
-                break
-            else:
-                if (
-                    temp_tile.shape == placement.tile.shape
-                    or temp_tile.color == placement.tile.color
-                ):
-                    x_line.append(temp_placement)
-                    x_count += 1
-                else:  # if there is an invalid match in the line
-                    x_line = None
-                    break
-            if temp_tile.__eq__(
-                placement.tile
-            ):  # if line already contains this tile, it is invalid
-                return None, y_line
-
-        for i in range(5):  # Checks up to 5 tiles to the left of the vertical
-            if placement.x_coord + i + 1 > 217:
-                break
-            temp_tile = board[placement.x_coord + i + 1][placement.y_coord]
-            temp_placement = Placement(
-                temp_tile, placement.x_coord - i - 1, placement.y_coord
-            )
-            if temp_tile is None:
-                break
-            else:
-                if (
-                    temp_tile.shape == placement.tile.shape
-                    or temp_tile.color == placement.tile.color
-                ):
-                    x_line.append(temp_placement)
-                    x_count += 1
-                else:
-                    x_line = None
-                    break
-            # Checks if line is too large or if it already contains a given tile
-            if x_count > 5 or temp_tile.__eq__(placement.tile):
-                x_line = None
-                break
-
+        x_line, y_line = extract_lines(placement, board)
+        cell = placement.tile.cell_value
+        if x_line is not None and not x_line.mask.can_extend(cell):
+            x_line = None
+        if y_line is not None and not y_line.mask.can_extend(cell):
+            y_line = None
         return x_line, y_line
 
     def verify_placement(self, placement: Placement, board: Board) -> bool:
@@ -166,8 +379,8 @@ class Gamerules:
             True: if it is a valid placement
             False: if it is not a valid placement
         """
-        x_line, y_line = self.get_lines(placement)
-        if x_line == [] and y_line == [] or x_line is None or y_line is None:
+        x_line, y_line = self.get_lines(placement, board)
+        if x_line is None or y_line is None or len(x_line) == 0 and len(y_line) == 0:
             return False
         else:
             return True
@@ -191,25 +404,75 @@ class Gamerules:
     def score_move(self, move: List[Placement], board: Board) -> int:
         """Scores a given move.
 
-        Currently score relies on temporary tile information so scoring must happen before a move is fully
-        registered
-
         Args:
             move: A list of placements containing a tile and it's given indices
                 to represent the most recent move. For example:
 
                 {(Tile 1, x cord 1, y cord 1), (Tile 2, x cord 2, y cord 2)...}
-            board: contains the game board
+            board: contains the game board, with or without the move's tiles
 
         Returns:
             Integer represent of the score of the move.
+
+        Raises:
+            ValueError: if the move is illegal
         """
-        score = 0
-        for placement in move:
-            score += self.score_placement(placement, board)
+        return self.score_breakdown(move, board).total
+
+    def score_breakdown(self, move: List[Placement], board: Board) -> "MoveScore":
+        """Scores a given move line by line.
+
+        The main line of the move and the distinct lines perpendicular to it
+        are each found and scored once: a line of two or more tiles scores
+        its length, plus 6 for a Quirkle. A lone tile scores 1. Scoring only
+        depends on the positions in the move, not on temporary flags, so the
+        board may be a snapshot that does not contain the move.
+
+        Args:
+            move: A list of placements containing a tile and it's given indices
+                to represent the most recent move.
+            board: contains the game board, with or without the move's tiles
 
+        Returns:
+            MoveScore containing the score of every scoring line.
+
+        Raises:
+            ValueError: if the move is illegal
+        """
+        validation, score = self.check_move(move, board)
+        if not validation:
+            raise ValueError(repr(validation))
         return score
 
+    def check_move(
+        self, move: List[Placement], board: Board
+    ) -> Tuple[MoveValidation, "MoveScore | None"]:
+        """Validates and scores a move in one pass
+
+        Finds the lines formed by the move once and uses them both to
+        validate and to score it, as validate_move and score_breakdown
+        would each do on their own.
+
+        Args:
+            move: A list of placements containing a tile and it's given indices
+                to represent the most recent move.
+            board: contains the game board, with or without the move's tiles
+
+        Returns:
+            Tuple of the MoveValidation of the move and its MoveScore, which is
+                None if the move is illegal.
+        """
+        validation, lines = self.__move_lines(move, board)
+        if not validation:
+            return validation, None
+        line_scores = list()
+        for line, _ in lines:
+            if len(line.run) > 1:
+                line_scores.append(LineScore(line))
+        if len(line_scores) == 0:  # A lone tile still scores for itself
+            line_scores.append(LineScore(lines[0][0]))
+        return validation, MoveScore(line_scores)
+
     def score_placement(self, placement: Placement, board: Board) -> int:
         """Scores a given placement
 
@@ -222,27 +485,15 @@ class Gamerules:
         """
         score = 0
         x_line, y_line = self.get_lines(placement, board)
-        already_scored = False  # Keeps track of whether the line(s) of placement have already been scored on this turn
-        if x_line is not None:
-            for placement in x_line:
-                if placement.tile.is_temporary():
-                    already_scored = True
-            if already_scored == True:
-                score += 1
-            else:
-                score += len(x_line) + 1
-            if len(x_line) == 5:  # Checks for Quirkle
-                score += 6
-        already_scored = False
-        if y_line is not None:
-            for placement in y_line:
-                if placement.tile.is_temporary():
-                    already_scored = True
-            if already_scored == True:
+        for line in (x_line, y_line):
+            if line is None:
+                continue
+            # A line holding other temporary tiles was already scored on this turn
+            if line.has_temporary():
                 score += 1
             else:
-                score += len(y_line) + 1
-            if len(y_line) == 5:  # Checks for Quirkle
+                score += len(line) + 1
+            if len(line) == Line.MAX_LENGTH - 1:  # Checks for Quirkle
                 score += 6
         return score
 
@@ -260,35 +511,16 @@ class Gamerules:
             return -1
 
         x_line, y_line = self.get_lines(placement, board)
+        if x_line is None or y_line is None:
+            return -1
 
-        x_length = x_line.__len__() + 1
-        y_length = y_line.__len__() + 1
         scoreRemoval = 0
-
-        if x_length == 6:  # Removes Quirkle points
-            scoreRemoval += 6
-
-        hasTemp = False
-        for placement in x_line:
-            if placement.tile.is_temporary():
-                hasTemp = True
-        if hasTemp:
-            scoreRemoval += 1
-        else:
-            scoreRemoval += x_length
-            print(x_length)
-
-        if y_length == 6:  # Removes Quirkle points
-            scoreRemoval += 6
-
-        hasTemp = False
-        for placement in y_line:
-            if placement.tile.is_temporary():
-                hasTemp = True
-        if hasTemp:
-            scoreRemoval += 1
-        else:
-            scoreRemoval += y_length
-            print(y_length)
+        for line in (x_line, y_line):
+            if len(line) + 1 == Line.MAX_LENGTH:  # Removes Quirkle points
+                scoreRemoval += 6
+            if line.has_temporary():
+                scoreRemoval += 1
+            else:
+                scoreRemoval += len(line) + 1
 
         return scoreRemoval
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Final
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Final, Set, Tuple
 from enum import IntEnum
 import json
 
@@ -7,13 +7,38 @@ import numpy as np
 import numpy.typing as npt
 
 
+# json_deserialize of every JsonableObject subclass, keyed by JSONABLE_TYPE
+JSONABLE_TYPES: Final[Dict[str, Callable[[Dict[str, Any]], Any]]] = dict()
+
+
 class JsonableObject(ABC):
     """Base class of objects that can be represented as JSON.
 
     Subclasses of this object support conversion to / from
-    its JSON form.
+    its JSON form. A subclass defining JSONABLE_TYPE is registered in
+    JSONABLE_TYPES on creation, so that JsonableDecoder turns dictionaries
+    whose "type" is that name into objects of the subclass.
     """
 
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        type_name = cls.__dict__.get("JSONABLE_TYPE")
+        if type_name is None:
+            return
+        registered = JSONABLE_TYPES.get(type_name)
+        # Only the same class, as when its module is reloaded, may register again
+        if registered is not None and (
+            registered.__module__ != cls.__module__
+            or registered.__qualname__ != cls.__qualname__ + ".json_deserialize"
+        ):
+            raise ValueError(
+                "JSONABLE_TYPE %r of %s is already used by %s"
+                % (type_name, cls.__qualname__, registered.__qualname__)
+            )
+        JSONABLE_TYPES[type_name] = cls.json_deserialize
+
     @abstractmethod
     def json_serialize(self) -> Dict[str, Any]:
         """Returns JSON representation of this object.
@@ -67,21 +92,49 @@ class Tile(JsonableObject):
     """
     Python representation of a Quirkle tile
 
+    Tiles are immutable flyweights: there is exactly one instance for each
+    of the 36 tile types in its temporary and permanent form, so calling
+    Tile(color, shape, temp) always returns the same object for the same
+    arguments, and two tiles are equal only if they are the same object.
+
     Args:
         __color: color of the tile
         __shape: shape of the tile
         __temporary: boolean to tell if the tile is temporary
+        __cell: cell_value of the tile
     """
 
     JSONABLE_TYPE: Final[str] = "tile"
+    TEMPORARY_BIT: Final[int] = 0x80
+    __slots__ = ("__color", "__shape", "__temporary", "__cell")
     __color: TileColor
     __shape: TileShape
     __temporary: bool
+    __cell: int
+    __CELL_TABLE: Final[List["Tile"]] = [None] * 0x100
+
+    def __new__(cls, color: TileColor, shape: TileShape, temp: bool = True) -> "Tile":
+        tile = None
+        if 0 < color <= 0x0F and 0 < shape < Tile.TEMPORARY_BIT and not shape & 0x0F:
+            tile = Tile.__CELL_TABLE[
+                color ^ shape | (Tile.TEMPORARY_BIT if temp else 0)
+            ]
+        if tile is None:
+            raise ValueError("Invalid tile: %r %r" % (color, shape))
+        return tile
 
-    def __init__(self, color: TileColor, shape: TileShape, temp: bool = True) -> None:
-        self.__color = color
-        self.__shape = shape
-        self.__temporary = temp
+    @staticmethod
+    def _intern_all() -> None:
+        """Creates the canonical instance of every tile. Called once on import."""
+        for color in TileColor:
+            for shape in TileShape:
+                for temp in (True, False):
+                    tile = object.__new__(Tile)
+                    tile.__color = color
+                    tile.__shape = shape
+                    tile.__temporary = temp
+                    tile.__cell = color ^ shape | (Tile.TEMPORARY_BIT if temp else 0)
+                    Tile.__CELL_TABLE[tile.__cell] = tile
 
     @property
     def color(self):
@@ -105,7 +158,29 @@ class Tile(JsonableObject):
         Returns:
             Specific hex value for the tile type
         """
-        return self.color.value ^ self.shape.value
+        return self.__cell & ~Tile.TEMPORARY_BIT
+
+    @property
+    def cell_value(self):
+        """
+        Single byte representing this tile within a board cell
+
+        Returns:
+            hex_value of the tile, with TEMPORARY_BIT set if the tile is temporary
+        """
+        return self.__cell
+
+    @staticmethod
+    def from_cell(cell: int):
+        """Gets tile represented by a board cell
+
+        Args:
+            cell: byte value of the cell, as given by cell_value
+
+        Returns:
+            Tile the cell represents, or None if the cell is empty or invalid
+        """
+        return Tile.__CELL_TABLE[cell]
 
     def is_temporary(self):
         """
@@ -116,11 +191,23 @@ class Tile(JsonableObject):
         """
         return self.__temporary
 
-    def set_permanent(self):
+    def as_permanent(self):
+        """
+        Gets the permanent form of this tile
+
+        Returns:
+            Tile of the same type that is not marked as temporary
+        """
+        return Tile.__CELL_TABLE[self.__cell & ~Tile.TEMPORARY_BIT]
+
+    def as_temporary(self):
         """
-        Marks this tile as permanent
+        Gets the temporary form of this tile
+
+        Returns:
+            Tile of the same type that is marked as temporary
         """
-        self.__temporary = False
+        return Tile.__CELL_TABLE[self.__cell | Tile.TEMPORARY_BIT]
 
     def __eq__(self, __o: object) -> bool:
         """Checks if two tiles are equal
@@ -129,14 +216,13 @@ class Tile(JsonableObject):
             True: if they are
             False: if not
         """
-        if isinstance(__o, Tile):
-            return (
-                self.__color == __o.__color
-                and self.__shape == __o.__shape
-                and self.__temporary == __o.__temporary
-            )
-        else:
-            return False
+        return self is __o
+
+    def __hash__(self) -> int:
+        return self.__cell
+
+    def __reduce__(self):
+        return (Tile.from_cell, (self.__cell,))
 
     def __repr__(self) -> str:
         if self.__temporary:
@@ -156,11 +242,175 @@ class Tile(JsonableObject):
     def json_deserialize(serialized_form: Dict[str, bool | int]):
         if type(serialized_form) is not dict:
             raise TypeError
-        new_tile = Tile(0, 0)
-        new_tile.__color = TileColor(serialized_form["tile_type"] & 0x0F)
-        new_tile.__shape = TileShape(serialized_form["tile_type"] & 0xF0)
-        new_tile.__temporary = serialized_form["temporary"]
-        return new_tile
+        tile_type = serialized_form["tile_type"]
+        if type(tile_type) is not int or not 0 < tile_type < Tile.TEMPORARY_BIT:
+            raise ValueError("Invalid tile type: %r" % (tile_type,))
+        tile = Tile.__CELL_TABLE[
+            tile_type | (Tile.TEMPORARY_BIT if serialized_form["temporary"] else 0)
+        ]
+        if tile is None:
+            raise ValueError("Invalid tile type: %r" % (tile_type,))
+        return tile
+
+
+Tile._intern_all()
+
+# Bitmask tables used by the rules engine, indexed by cell byte (the temporary
+# bit is ignored). Each of the 36 tile types owns one bit of a "kind mask",
+# each color and shape one bit of a 6-bit color or shape mask.
+ALL_KINDS: Final[int] = (1 << 36) - 1
+KIND_BITS: Final[List[int]] = [0] * 0x100
+COLOR_BITS: Final[List[int]] = [0] * 0x100
+SHAPE_BITS: Final[List[int]] = [0] * 0x100
+# Kind masks of all tiles of a color / shape, indexed by color / shape bit
+COLOR_KINDS: Final[Dict[int, int]] = dict()
+SHAPE_KINDS: Final[Dict[int, int]] = dict()
+# Kind mask of the tiles that may share a line with a tile: same color or
+# same shape, but not both
+COMPATIBLE_KINDS: Final[List[int]] = [0] * 0x100
+
+
+def _build_tile_tables() -> None:
+    """Fills the bitmask tables. Called once on import."""
+    for color in TileColor:
+        for shape in TileShape:
+            kind = color ^ shape
+            color_bit = 1 << (color - 1)
+            shape_bit = 1 << ((shape >> 4) - 1)
+            kind_bit = 1 << ((color - 1) * len(TileShape) + (shape >> 4) - 1)
+            COLOR_KINDS[color_bit] = COLOR_KINDS.get(color_bit, 0) | kind_bit
+            SHAPE_KINDS[shape_bit] = SHAPE_KINDS.get(shape_bit, 0) | kind_bit
+            for cell in (kind, kind | Tile.TEMPORARY_BIT):
+                KIND_BITS[cell] = kind_bit
+                COLOR_BITS[cell] = color_bit
+                SHAPE_BITS[cell] = shape_bit
+    for cell in range(0x100):
+        if KIND_BITS[cell]:
+            COMPATIBLE_KINDS[cell] = (
+                COLOR_KINDS[COLOR_BITS[cell]] ^ SHAPE_KINDS[SHAPE_BITS[cell]]
+            )
+
+
+_build_tile_tables()
+
+
+class LineMask:
+    """Bitmask summary of a line of tiles
+
+    Tracks which colors, shapes and tile types a line contains, and the
+    kind mask of tiles that may still extend it, so checking a tile
+    against a line is a single bit test instead of a scan of the line.
+
+    Attributes:
+        colors: 6-bit mask of the colors in the line
+        shapes: 6-bit mask of the shapes in the line
+        kinds: 36-bit mask of the tile types in the line
+        length: number of tiles in the line
+        allowed: 36-bit mask of the tile types that may extend the line
+        valid: whether the line is legal by the game's rules
+    """
+
+    MAX_LENGTH: Final[int] = 6
+    __slots__ = ("__colors", "__shapes", "__kinds", "__length", "__allowed", "__valid")
+    __colors: int
+    __shapes: int
+    __kinds: int
+    __length: int
+    __allowed: int
+    __valid: bool
+
+    def __init__(self) -> None:
+        """Creates mask of an empty line"""
+        self.__colors = 0
+        self.__shapes = 0
+        self.__kinds = 0
+        self.__length = 0
+        self.__allowed = ALL_KINDS
+        self.__valid = True
+
+    @staticmethod
+    def from_cells(cells: Iterable[int]) -> "LineMask":
+        """Creates mask of a line
+
+        Args:
+            cells: cell bytes of the tiles in the line
+
+        Returns:
+            Mask of a line made of the given tiles
+        """
+        mask = LineMask()
+        for cell in cells:
+            mask = mask.extend(cell)
+        return mask
+
+    @property
+    def colors(self) -> int:
+        return self.__colors
+
+    @property
+    def shapes(self) -> int:
+        return self.__shapes
+
+    @property
+    def kinds(self) -> int:
+        return self.__kinds
+
+    @property
+    def length(self) -> int:
+        return self.__length
+
+    @property
+    def allowed(self) -> int:
+        return self.__allowed
+
+    @property
+    def valid(self) -> bool:
+        return self.__valid
+
+    def can_extend(self, cell: int) -> bool:
+        """Checks whether a tile may be added to the line
+
+        Args:
+            cell: cell byte of the tile
+
+        Returns:
+            True if the line is still legal with the tile added
+        """
+        return self.__allowed & KIND_BITS[cell] != 0
+
+    def extend(self, cell: int) -> "LineMask":
+        """Creates mask of this line with a tile added
+
+        Args:
+            cell: cell byte of the tile to add
+
+        Returns:
+            Mask of the extended line, which is not valid if the tile may not
+                extend this line
+        """
+        mask = LineMask.__new__(LineMask)
+        mask.__colors = self.__colors | COLOR_BITS[cell]
+        mask.__shapes = self.__shapes | SHAPE_BITS[cell]
+        mask.__kinds = self.__kinds | KIND_BITS[cell]
+        mask.__length = self.__length + 1
+        mask.__valid = self.__valid and self.can_extend(cell)
+        if not mask.__valid or mask.__length >= LineMask.MAX_LENGTH:
+            mask.__allowed = 0
+        elif mask.__length == 1:
+            mask.__allowed = COMPATIBLE_KINDS[cell]
+        else:
+            # A line shares a color or a shape only while its mask has a single bit
+            mask.__allowed = (
+                COLOR_KINDS.get(mask.__colors, 0) | SHAPE_KINDS.get(mask.__shapes, 0)
+            ) & ~mask.__kinds
+        return mask
+
+    def __repr__(self) -> str:
+        return "LineMask(colors=%s, shapes=%s, length=%d)" % (
+            bin(self.__colors),
+            bin(self.__shapes),
+            self.__length,
+        )
 
 
 class Placement(JsonableObject):
@@ -173,6 +423,7 @@ class Placement(JsonableObject):
     """
 
     JSONABLE_TYPE: Final[str] = "placement"
+    __slots__ = ("__tile", "__x_coord", "__y_coord")
     __tile: Tile
     __x_coord: int
     __y_coord: int
@@ -211,6 +462,9 @@ class Placement(JsonableObject):
         else:
             return False
 
+    def __hash__(self) -> int:
+        return hash((self.__tile, self.__x_coord, self.__y_coord))
+
     def __repr__(self) -> str:
         return "%s at (%d, %d)" % (self.__tile.__repr__(), self.x_coord, self.y_coord)
 
@@ -226,30 +480,465 @@ class Placement(JsonableObject):
     def json_deserialize(serialized_form: Dict[str, str | Tile | List[int]]):
         if type(serialized_form) is not dict:
             raise TypeError
-        new_placement = Placement(None, -1, -1)
-        new_placement.__tile = serialized_form["tile"]
-        new_placement.__x_coord = serialized_form["pos"][0]
-        new_placement.__y_coord = serialized_form["pos"][1]
-        return new_placement
+        return Placement(
+            serialized_form["tile"],
+            serialized_form["pos"][0],
+            serialized_form["pos"][1],
+        )
 
 
 class Board(JsonableObject):
     """Contains the representation of the gameboard
 
+    The board is unbounded: cells are stored sparsely in square chunks of
+    CHUNK_SIZE x CHUNK_SIZE bytes, keyed by chunk coordinates, and a chunk
+    only exists while at least one tile is placed in it. Each cell holds
+    the cell_value of the tile placed there, or 0 if the cell is empty.
+    Tiles are reconstructed from these bytes when requested.
+
+    An index of occupied cells and their bounding box is kept up to date
+    by add_tile and remove_tile, so iterating over the placed tiles costs
+    O(tiles) rather than O(board area). The same methods maintain a 64-bit
+    Zobrist-style fingerprint of the board contents: the XOR of a
+    pseudo-random key for every (x, y, cell) on the board.
+
+    Boards can be forked cheaply: a fork shares its chunks and index with
+    the board it came from, and copies them only when either board is
+    first modified. The first write copies the index and frontier
+    dictionaries whole, which is O(tiles), while chunks are copied one at
+    a time as they are written; no board array is copied in full.
+
+    The board also maintains its frontier: every empty cell next to a placed
+    tile, with the kind mask of tiles the lines through that cell would
+    accept. add_tile and remove_tile only update the frontier cells at the
+    ends of the lines through the changed cell. Boards built in bulk by
+    from_arrays leave the frontier unbuilt until it is first needed.
+
+    A board received from the server carries the server's version number
+    of it, so that later BoardDelta updates can be applied in place.
+
     Attributes:
-        board: a 217x217 array of Tiles
+        chunks: dictionary mapping chunk coordinates to arrays of cell bytes
+        occupied: dictionary mapping (x, y) of every placed tile to its cell byte
+        bounds: bounding box of the placed tiles as (min_x, min_y, max_x, max_y)
+        fingerprint: hash of the board contents, equal for equal boards
+        owned: keys of chunks that are not shared with any other board
+        shared: whether chunks and index dictionaries are shared with another board
+        frozen: whether this board is a read-only snapshot
+        frontier: dictionary mapping (x, y) of every empty cell next to a placed
+            tile to the kind mask of tiles that may be placed there, or None
+            until it is first needed
+        version: version number of the board on the server, 0 if unknown
     """
 
     JSONABLE_TYPE: Final[str] = "board"
     ROW: Final = 217
     COLUMN: Final = 217
+    CHUNK_SIZE: Final = 16
+    __CHUNK_SHIFT: Final = 4
+    __CHUNK_MASK: Final = 0x0F
+    __KEY_MASK: Final = 0xFFFFFFFFFFFFFFFF
+    __DIRECTIONS: Final = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    __VALID_CELLS: Final = np.array(
+        [Tile.from_cell(cell) is not None for cell in range(0x100)]
+    )
+    __chunks: Dict[Tuple[int, int], npt.NDArray[np.uint8]]
+    __occupied: Dict[Tuple[int, int], int]
+    __bounds: Tuple[int, int, int, int] | None
+    __fingerprint: int
+    __owned: Set[Tuple[int, int]]
+    __shared: bool
+    __frozen: bool
+    __frontier: Dict[Tuple[int, int], int] | None
+    __version: int
 
     def __init__(self):
         """Inits the board"""
-        self.__board = np.zeros((Board.ROW, Board.COLUMN), np.object_)
+        self.__chunks = dict()
+        self.__occupied = dict()
+        self.__bounds = None
+        self.__fingerprint = 0
+        self.__owned = set()
+        self.__shared = False
+        self.__frozen = False
+        self.__frontier = dict()
+        self.__version = 0
+
+    def fork(self, frontier: bool = True) -> "Board":
+        """Creates a modifiable copy of this board
+
+        The copy shares storage with this board until one of them is
+        modified, so forking is O(1). The first write to either board then
+        copies the index and frontier dictionaries, which is O(tiles), and
+        each chunk it writes to.
+
+        Args:
+            frontier: whether the copy keeps the frontier up to date; without
+                it, placing tiles on the copy skips the frontier upkeep, and
+                the frontier is rebuilt if it is ever queried
 
-    def get_board(self) -> npt.NDArray[np.object_]:
-        return self.__board
+        Returns:
+            New board with the same tiles as this board
+        """
+        new_board = Board.__new__(Board)
+        new_board.__chunks = self.__chunks
+        new_board.__occupied = self.__occupied
+        new_board.__bounds = self.__bounds
+        new_board.__fingerprint = self.__fingerprint
+        new_board.__owned = set()
+        new_board.__shared = True
+        new_board.__frozen = False
+        new_board.__frontier = self.__frontier if frontier else None
+        new_board.__version = self.__version
+        if not self.__frozen:
+            self.__shared = True
+        return new_board
+
+    @staticmethod
+    def from_cells(cells: Iterable[Tuple[int, int, int]], version: int = 0) -> "Board":
+        """Creates a board from the cell bytes of its tiles
+
+        Args:
+            cells: (x, y, cell) of every tile, as yielded by Board.cells
+            version: version number of the board on the server
+
+        Returns:
+            The new board
+
+        Raises:
+            ValueError: if a cell byte is not a valid tile
+        """
+        columns = np.array(list(cells), np.int64).reshape(-1, 3).T
+        return Board.from_arrays(columns[0], columns[1], columns[2], version)
+
+    @staticmethod
+    def from_arrays(
+        xs: npt.ArrayLike, ys: npt.ArrayLike, cells: npt.ArrayLike, version: int = 0
+    ) -> "Board":
+        """Creates a board from parallel arrays of positions and cell bytes
+
+        Builds the chunks, index, bounds and fingerprint with vector
+        operations, without creating a Tile or Placement per tile. The
+        frontier is only built once it is first needed.
+
+        Args:
+            xs: x coordinate of every tile
+            ys: y coordinate of every tile
+            cells: cell byte of every tile
+            version: version number of the board on the server
+
+        Returns:
+            The new board
+
+        Raises:
+            ValueError: if an array does not hold integers, the arrays differ
+                in length, a cell byte is not a valid tile, or two tiles share
+                a position
+        """
+        xs = Board.__integer_array(xs)
+        ys = Board.__integer_array(ys)
+        cells = Board.__integer_array(cells)
+        if not xs.shape == ys.shape == cells.shape or xs.ndim != 1:
+            raise ValueError("Position and cell arrays differ in shape")
+        if np.any((cells < 0) | (cells > 0xFF)) or not np.all(
+            Board.__VALID_CELLS[cells & 0xFF]
+        ):
+            raise ValueError("Invalid tile byte in board")
+        new_board = Board()
+        new_board.__version = version
+        new_board.__frontier = None
+        new_board.__occupied = dict(zip(zip(xs.tolist(), ys.tolist()), cells.tolist()))
+        if len(new_board.__occupied) != len(cells):
+            raise ValueError("Two tiles share a position")
+        if len(cells) == 0:
+            return new_board
+
+        chunk_xs = xs >> Board.__CHUNK_SHIFT
+        chunk_ys = ys >> Board.__CHUNK_SHIFT
+        for key in set(zip(chunk_xs.tolist(), chunk_ys.tolist())):
+            in_chunk = (chunk_xs == key[0]) & (chunk_ys == key[1])
+            chunk = np.zeros((Board.CHUNK_SIZE, Board.CHUNK_SIZE), np.uint8)
+            chunk[
+                ys[in_chunk] & Board.__CHUNK_MASK, xs[in_chunk] & Board.__CHUNK_MASK
+            ] = cells[in_chunk]
+            new_board.__chunks[key] = chunk
+            new_board.__owned.add(key)
+        new_board.__bounds = (
+            int(xs.min()),
+            int(ys.min()),
+            int(xs.max()),
+            int(ys.max()),
+        )
+        new_board.__fingerprint = int(
+            np.bitwise_xor.reduce(Board.__cell_keys(xs, ys, cells))
+        )
+        return new_board
+
+    @staticmethod
+    def __integer_array(values: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Converts to an int64 array, refusing values that are not integers"""
+        array = np.asarray(values)
+        if array.size == 0:
+            return array.astype(np.int64)
+        if array.dtype.kind not in "iu":
+            raise ValueError("Expected integers, got %s" % array.dtype)
+        return array.astype(np.int64)
+
+    def snapshot(self) -> "Board":
+        """Creates a read-only copy of this board
+
+        Like fork, but the returned board raises TypeError on modification.
+        Snapshots of snapshots are the snapshot itself.
+
+        Returns:
+            Frozen board with the same tiles as this board
+        """
+        if self.__frozen:
+            return self
+        new_board = self.fork()
+        new_board.__frozen = True
+        return new_board
+
+    @property
+    def frozen(self) -> bool:
+        """Whether this board is a read-only snapshot"""
+        return self.__frozen
+
+    def __prepare_write(self, key: Tuple[int, int]) -> npt.NDArray[np.uint8] | None:
+        """Makes storage of this board private before it is modified
+
+        Args:
+            key: chunk coordinates of the cell about to be modified
+        Returns: the chunk with the given key owned by this board, if any
+        """
+        if self.__frozen:
+            raise TypeError("Board snapshot cannot be modified")
+        if self.__shared:
+            self.__chunks = dict(self.__chunks)
+            self.__occupied = dict(self.__occupied)
+            if self.__frontier is not None:
+                self.__frontier = dict(self.__frontier)
+            self.__owned = set()
+            self.__shared = False
+        chunk = self.__chunks.get(key)
+        if chunk is not None and key not in self.__owned:
+            chunk = chunk.copy()
+            self.__chunks[key] = chunk
+            self.__owned.add(key)
+        return chunk
+
+    @staticmethod
+    def cell_key(x: int, y: int, cell: int) -> int:
+        """Zobrist key of a single cell
+
+        The key is derived by mixing the position and cell byte with
+        SplitMix64, so it is stable across processes and needs no table
+        for an unbounded board.
+
+        Args:
+            x: x coordinate
+            y: y coordinate
+            cell: cell_value of the tile at the position
+        Returns: 64-bit key for the given tile at the given position
+        """
+        key = ((x & 0xFFFFFF) << 40 | (y & 0xFFFFFF) << 16 | cell) & Board.__KEY_MASK
+        key = (key + 0x9E3779B97F4A7C15) & Board.__KEY_MASK
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & Board.__KEY_MASK
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & Board.__KEY_MASK
+        return key ^ (key >> 31)
+
+    @staticmethod
+    def __cell_keys(
+        xs: npt.NDArray[np.int64], ys: npt.NDArray[np.int64], cells: npt.NDArray
+    ) -> npt.NDArray[np.uint64]:
+        """Zobrist keys of many cells at once, as computed by cell_key"""
+        keys = (
+            ((xs & 0xFFFFFF) << 40 | (ys & 0xFFFFFF) << 16 | cells)
+            .astype(np.int64)
+            .view(np.uint64)
+        )
+        keys = keys + np.uint64(0x9E3779B97F4A7C15)
+        keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return keys ^ (keys >> np.uint64(31))
+
+    def get_board(self) -> npt.NDArray[np.uint8]:
+        """Gets the cells within the default ROW x COLUMN play area
+
+        Returns:
+            Copy of the cell bytes of the area, indexed as [y, x]
+        """
+        dense = np.zeros((Board.ROW, Board.COLUMN), np.uint8)
+        for (chunk_x, chunk_y), chunk in self.__chunks.items():
+            x = chunk_x << Board.__CHUNK_SHIFT
+            y = chunk_y << Board.__CHUNK_SHIFT
+            if 0 <= x < Board.COLUMN and 0 <= y < Board.ROW:
+                height = min(Board.CHUNK_SIZE, Board.ROW - y)
+                width = min(Board.CHUNK_SIZE, Board.COLUMN - x)
+                dense[y : y + height, x : x + width] = chunk[:height, :width]
+        return dense
+
+    def get_row(self, y: int, x_start: int, x_stop: int) -> npt.NDArray[np.uint8]:
+        """Gets cell bytes of a horizontal segment of the board
+
+        Args:
+            y: y coordinate of the row
+            x_start: first x coordinate of the segment
+            x_stop: x coordinate one past the end of the segment
+        Returns: array of cell bytes for x in [x_start, x_stop)
+        """
+        segment = np.zeros(x_stop - x_start, np.uint8)
+        chunk_y = y >> Board.__CHUNK_SHIFT
+        x = x_start
+        while x < x_stop:
+            end = min(((x >> Board.__CHUNK_SHIFT) + 1) << Board.__CHUNK_SHIFT, x_stop)
+            chunk = self.__chunks.get((x >> Board.__CHUNK_SHIFT, chunk_y))
+            if chunk is not None:
+                offset = x & Board.__CHUNK_MASK
+                segment[x - x_start : end - x_start] = chunk[
+                    y & Board.__CHUNK_MASK, offset : offset + end - x
+                ]
+            x = end
+        return segment
+
+    def get_column(self, x: int, y_start: int, y_stop: int) -> npt.NDArray[np.uint8]:
+        """Gets cell bytes of a vertical segment of the board
+
+        Args:
+            x: x coordinate of the column
+            y_start: first y coordinate of the segment
+            y_stop: y coordinate one past the end of the segment
+        Returns: array of cell bytes for y in [y_start, y_stop)
+        """
+        segment = np.zeros(y_stop - y_start, np.uint8)
+        chunk_x = x >> Board.__CHUNK_SHIFT
+        y = y_start
+        while y < y_stop:
+            end = min(((y >> Board.__CHUNK_SHIFT) + 1) << Board.__CHUNK_SHIFT, y_stop)
+            chunk = self.__chunks.get((chunk_x, y >> Board.__CHUNK_SHIFT))
+            if chunk is not None:
+                offset = y & Board.__CHUNK_MASK
+                segment[y - y_start : end - y_start] = chunk[
+                    offset : offset + end - y, x & Board.__CHUNK_MASK
+                ]
+            y = end
+        return segment
+
+    def frontier(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterates over the empty cells next to placed tiles
+
+        Returns:
+            Iterator of (x, y, allowed) tuples, where allowed is the kind mask
+                (see KIND_BITS) of tiles the lines through the cell would accept
+        """
+        return ((x, y, allowed) for (x, y), allowed in self.__frontier_index().items())
+
+    def allowed_kinds(self, x: int, y: int) -> int:
+        """Kind mask of tiles the lines through a cell would accept
+
+        Args:
+            x: x coordinate
+            y: y coordinate
+        Returns: kind mask (see KIND_BITS) of tiles that may be placed at the
+            cell; 0 if the cell is occupied, ALL_KINDS if it has no neighbours
+        """
+        if (x, y) in self.__occupied:
+            return 0
+        return self.__frontier_index().get((x, y), ALL_KINDS)
+
+    def __frontier_index(self) -> Dict[Tuple[int, int], int]:
+        """Frontier of the board, built from the occupied cells if needed"""
+        if self.__frontier is None:
+            self.__frontier = dict()
+            for x, y in self.__occupied:
+                for dx, dy in Board.__DIRECTIONS:
+                    position = (x + dx, y + dy)
+                    if position not in self.__frontier:
+                        self.__update_frontier(*position)
+        return self.__frontier
+
+    def __run_end(self, x: int, y: int, dx: int, dy: int) -> Tuple[int, int]:
+        """First empty cell from (x, y) in the given direction"""
+        x += dx
+        y += dy
+        while (x, y) in self.__occupied:
+            x += dx
+            y += dy
+        return x, y
+
+    def __run_cells(self, x: int, y: int, dx: int, dy: int) -> List[int]:
+        """Cell bytes of the tiles next to (x, y) in the given direction"""
+        cells = list()
+        cell = self.__occupied.get((x + dx, y + dy), 0)
+        while cell != 0 and len(cells) <= LineMask.MAX_LENGTH:
+            cells.append(cell)
+            x += dx
+            y += dy
+            cell = self.__occupied.get((x + dx, y + dy), 0)
+        return cells
+
+    def __update_frontier(self, x: int, y: int) -> None:
+        """Recomputes the frontier entry of a cell"""
+        if (x, y) in self.__occupied:
+            self.__frontier.pop((x, y), None)
+            return
+        horizontal = self.__run_cells(x, y, -1, 0) + self.__run_cells(x, y, 1, 0)
+        vertical = self.__run_cells(x, y, 0, -1) + self.__run_cells(x, y, 0, 1)
+        if len(horizontal) == 0 and len(vertical) == 0:
+            self.__frontier.pop((x, y), None)
+            return
+        self.__frontier[x, y] = (
+            LineMask.from_cells(horizontal).allowed
+            & LineMask.from_cells(vertical).allowed
+        )
+
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        """Iterates over the positions of all placed tiles
+
+        Returns:
+            Iterator of (x, y) tuples
+        """
+        return iter(self.__occupied.keys())
+
+    def cells(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterates over all placed tiles in their byte form
+
+        Returns:
+            Iterator of (x, y, cell) tuples, where cell is the tile's cell_value
+        """
+        return ((x, y, cell) for (x, y), cell in self.__occupied.items())
+
+    def __iter__(self) -> Iterator[Placement]:
+        """Iterates over all placed tiles as placements"""
+        return (
+            Placement(Tile.from_cell(cell), x, y)
+            for (x, y), cell in self.__occupied.items()
+        )
+
+    def __len__(self) -> int:
+        """Number of tiles placed on the board"""
+        return len(self.__occupied)
+
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        """Checks whether a tile is placed at the given (x, y)"""
+        return position in self.__occupied
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int] | None:
+        """Bounding box of placed tiles as (min_x, min_y, max_x, max_y), inclusive.
+
+        None if no tile is placed on the board.
+        """
+        return self.__bounds
+
+    @property
+    def fingerprint(self) -> int:
+        """64-bit hash of the tiles on the board, including their temporary flag.
+
+        Equal boards always have equal fingerprints, so it can serve as a
+        cheap key for deduplicating or caching board positions.
+        """
+        return self.__fingerprint
 
     def add_tile(self, placement: Placement):
         """Adds tile at given coordinates if there is no tile already there
@@ -257,11 +946,57 @@ class Board(JsonableObject):
         Args:
             placement: contains (Tile, x_coord, y_coord)
         """
-        if self.__board[placement.y_coord, placement.x_coord] == 0:
-            self.__board[placement.y_coord, placement.x_coord] = placement.tile
+        if (placement.x_coord, placement.y_coord) in self.__occupied:
+            return
+        key = (
+            placement.x_coord >> Board.__CHUNK_SHIFT,
+            placement.y_coord >> Board.__CHUNK_SHIFT,
+        )
+        chunk = self.__prepare_write(key)
+        if chunk is None:
+            chunk = np.zeros((Board.CHUNK_SIZE, Board.CHUNK_SIZE), np.uint8)
+            self.__chunks[key] = chunk
+            self.__owned.add(key)
+        y = placement.y_coord & Board.__CHUNK_MASK
+        x = placement.x_coord & Board.__CHUNK_MASK
+        chunk[y, x] = placement.tile.cell_value
+        self.__occupied[
+            placement.x_coord, placement.y_coord
+        ] = placement.tile.cell_value
+        self.__fingerprint ^= Board.cell_key(
+            placement.x_coord, placement.y_coord, placement.tile.cell_value
+        )
+        if self.__bounds is None:
+            self.__bounds = (
+                placement.x_coord,
+                placement.y_coord,
+                placement.x_coord,
+                placement.y_coord,
+            )
+        else:
+            min_x, min_y, max_x, max_y = self.__bounds
+            self.__bounds = (
+                min(min_x, placement.x_coord),
+                min(min_y, placement.y_coord),
+                max(max_x, placement.x_coord),
+                max(max_y, placement.y_coord),
+            )
+        if self.__frontier is not None:
+            for dx, dy in Board.__DIRECTIONS:
+                self.__update_frontier(
+                    *self.__run_end(placement.x_coord, placement.y_coord, dx, dy)
+                )
+            self.__frontier.pop((placement.x_coord, placement.y_coord), None)
 
     def get_tile(self, x: int, y: int) -> Tile:
-        return self.__board[y][x]
+        """Gets the tile at a given x and y
+
+        Args:
+            x: x coordinate
+            y: y coordinate
+        Returns: the tile at the given position, or None if the cell is empty
+        """
+        return Tile.from_cell(self.__occupied.get((x, y), 0))
 
     def remove_tile(self, x, y):
         """Removes a tile at a given x and y
@@ -271,46 +1006,239 @@ class Board(JsonableObject):
             y: y coordinate
         Returns: the tile that was removed
         """
-        tile = self.__board[y][x]
-        self.__board[y][x] = 0
-        return tile
+        if (x, y) not in self.__occupied:
+            return None
+        key = (x >> Board.__CHUNK_SHIFT, y >> Board.__CHUNK_SHIFT)
+        chunk = self.__prepare_write(key)
+        cell = self.__occupied.pop((x, y))
+        chunk[y & Board.__CHUNK_MASK, x & Board.__CHUNK_MASK] = 0
+        if not chunk.any():
+            del self.__chunks[key]
+            self.__owned.discard(key)
+        self.__fingerprint ^= Board.cell_key(x, y, cell)
+        if self.__frontier is not None:
+            self.__update_frontier(x, y)
+            for dx, dy in Board.__DIRECTIONS:
+                self.__update_frontier(*self.__run_end(x, y, dx, dy))
+        min_x, min_y, max_x, max_y = self.__bounds
+        if x in (min_x, max_x) or y in (min_y, max_y):
+            self.__update_bounds()
+        return Tile.from_cell(cell)
+
+    @property
+    def version(self) -> int:
+        """Version number of the board on the server, 0 if unknown"""
+        return self.__version
+
+    def apply_delta(self, delta: "BoardDelta"):
+        """Brings the board up to date with a delta from the server
+
+        Args:
+            delta: changes from this board's version to a newer one
+
+        Raises:
+            ValueError: if the delta does not start from this board's version;
+                the board is left unchanged and a full snapshot is needed
+            TypeError: if the board is a snapshot
+        """
+        if self.__frozen:
+            raise TypeError("Board snapshot cannot be modified")
+        if delta.base_version != self.__version:
+            raise ValueError(
+                "Delta from version %d cannot be applied to version %d"
+                % (delta.base_version, self.__version)
+            )
+        for x, y in delta.removed:
+            self.remove_tile(x, y)
+        for placement in delta.placed:
+            self.remove_tile(placement.x_coord, placement.y_coord)
+            self.add_tile(placement)
+        self.__version = delta.version
+
+    def __update_bounds(self):
+        """Recomputes bounding box from the occupied cell index"""
+        if len(self.__occupied) == 0:
+            self.__bounds = None
+            return
+        xs = [x for x, _ in self.__occupied.keys()]
+        ys = [y for _, y in self.__occupied.keys()]
+        self.__bounds = (min(xs), min(ys), max(xs), max(ys))
 
     def __eq__(self, __o: object) -> bool:
         if isinstance(__o, Board):
-            self_tile_pos = np.where(self.__board != 0)
-            self_pos_tuples = list(zip(self_tile_pos[0], self_tile_pos[1]))
-            other_tile_pos = np.where(__o.__board != 0)
-            other_pos_tuples = list(zip(other_tile_pos[0], other_tile_pos[1]))
-            if len(self_pos_tuples) != len(other_pos_tuples):
+            if self.__fingerprint != __o.__fingerprint:
                 return False
-            for self_pos_tuple in self_pos_tuples:
-                if self_pos_tuple not in other_pos_tuples:
-                    return False
-                elif (
-                    self.__board[self_pos_tuple[0], self_pos_tuple[1]]
-                    != __o.__board[self_pos_tuple[0], self_pos_tuple[1]]
-                ):
-                    return False
-            return True
+            return self.__occupied == __o.__occupied
         else:
             return False
 
-    def json_serialize(self) -> Dict[str, Dict[str, bool | int]]:
-        tile_pos = np.where(self.__board != 0)
-        pos_tuples = list(zip(tile_pos[1], tile_pos[0]))
-        dict_form = dict()
+    def json_serialize(self) -> Dict[str, str | int | List[int]]:
+        """Returns JSON representation of this board
+
+        Tiles are sent as parallel arrays of x and y coordinates, tile
+        bytes (hex_value) and temporary flags.
+
+        Returns:
+            JSON-serializable form of this board
+        """
+        dict_form: Dict[str, str | int | List[int]] = dict()
         dict_form["type"] = Board.JSONABLE_TYPE
-        for pos_tuple in pos_tuples:
-            tile: Tile = self.get_tile(pos_tuple[0], pos_tuple[1])
-            dict_form[str(pos_tuple)] = tile.json_serialize()
+        if self.__version != 0:
+            dict_form["version"] = self.__version
+        cells = list(self.__occupied.values())
+        dict_form["xs"] = [x for x, _ in self.__occupied]
+        dict_form["ys"] = [y for _, y in self.__occupied]
+        dict_form["tiles"] = [cell & (Tile.TEMPORARY_BIT - 1) for cell in cells]
+        dict_form["temporary"] = [cell >> 7 for cell in cells]
         return dict_form
 
-    def json_deserialize(serialized_form: Dict[str, Dict[str, bool | int]]):
+    @staticmethod
+    def json_deserialize(serialized_form: Dict[str, Any]):
+        """Constructs a board from its JSON serialized form
+
+        Reads the parallel array form straight into NumPy arrays. The older
+        form, mapping stringified "(x, y)" tuples to tiles, is also accepted.
+
+        Args:
+            serialized_form: JSON serialized form of a board
+
+        Returns:
+            The board
+
+        Raises:
+            TypeError: if the serialized form is not a dictionary
+            ValueError: if the serialized form is not a valid board
+        """
         if type(serialized_form) is not dict:
             raise TypeError
-        new_board = Board()
-        for pos_tuple in serialized_form.keys():
-            if pos_tuple != "type":
-                position = eval(pos_tuple)
-                new_board.__board[position[1], position[0]] = serialized_form[pos_tuple]
-        return new_board
+        version = serialized_form.get("version", 0)
+        if "xs" in serialized_form:
+            tiles = Board.__integer_array(serialized_form["tiles"])
+            temporary = Board.__integer_array(serialized_form["temporary"])
+            if tiles.shape != temporary.shape or np.any(temporary >> 1):
+                raise ValueError("Invalid temporary flags in board")
+            if np.any((tiles < 0) | (tiles >= Tile.TEMPORARY_BIT)):
+                raise ValueError("Invalid tile type in board")
+            return Board.from_arrays(
+                serialized_form["xs"],
+                serialized_form["ys"],
+                tiles | temporary << 7,
+                version,
+            )
+        cells = list()
+        for key, tile in serialized_form.items():
+            if key in ("type", "version"):
+                continue
+            if not isinstance(tile, Tile):
+                tile = Tile.json_deserialize(tile)
+            cells.append((*Board.__parse_position(key), tile.cell_value))
+        return Board.from_cells(cells, version)
+
+    @staticmethod
+    def __parse_position(key: str) -> Tuple[int, int]:
+        """Parses a stringified "(x, y)" tuple of the older board form"""
+        text = key.strip()
+        if not (text.startswith("(") and text.endswith(")")):
+            raise ValueError("Invalid board position: %r" % key)
+        coordinates = text[1:-1].split(",")
+        if len(coordinates) != 2:
+            raise ValueError("Invalid board position: %r" % key)
+        return int(coordinates[0]), int(coordinates[1])
+
+
+class BoardDelta(JsonableObject):
+    """Changes to the board between two of its versions on the server
+
+    Sent instead of the whole board once a client holds a recent version,
+    so the size of an update is proportional to the move it describes.
+
+    Attributes:
+        base_version: version the changes apply to
+        version: version of the board after the changes
+        placed: placements of tiles added or replaced
+        removed: (x, y) of cells emptied
+    """
+
+    JSONABLE_TYPE: Final[str] = "board_delta"
+    __slots__ = ("__base_version", "__version", "__placed", "__removed")
+    __base_version: int
+    __version: int
+    __placed: List[Placement]
+    __removed: List[Tuple[int, int]]
+
+    def __init__(
+        self,
+        base_version: int,
+        version: int,
+        placed: List[Placement],
+        removed: List[Tuple[int, int]],
+    ) -> None:
+        self.__base_version = base_version
+        self.__version = version
+        self.__placed = placed
+        self.__removed = removed
+
+    @staticmethod
+    def between(old: Board, new: Board, version: int | None = None) -> "BoardDelta":
+        """Computes the changes turning one board into another
+
+        Args:
+            old: board the changes apply to
+            new: board after the changes
+            version: version number of new, defaults to one past old's
+
+        Returns:
+            Delta from old's version to the new version
+        """
+        old_cells = {(x, y): cell for x, y, cell in old.cells()}
+        placed = list()
+        for x, y, cell in new.cells():
+            if old_cells.pop((x, y), 0) != cell:
+                placed.append(Placement(Tile.from_cell(cell), x, y))
+        return BoardDelta(
+            old.version,
+            old.version + 1 if version is None else version,
+            placed,
+            list(old_cells),
+        )
+
+    @property
+    def base_version(self):
+        return self.__base_version
+
+    @property
+    def version(self):
+        return self.__version
+
+    @property
+    def placed(self):
+        return self.__placed
+
+    @property
+    def removed(self):
+        return self.__removed
+
+    def __len__(self) -> int:
+        """Number of cells changed"""
+        return len(self.__placed) + len(self.__removed)
+
+    def json_serialize(self) -> Dict[str, str | int | List]:
+        dict_form = {
+            "type": BoardDelta.JSONABLE_TYPE,
+            "base": self.__base_version,
+            "version": self.__version,
+            "placed": [placement.json_serialize() for placement in self.__placed],
+            "removed": [[x, y] for x, y in self.__removed],
+        }
+        return dict_form
+
+    @staticmethod
+    def json_deserialize(serialized_form: Dict[str, str | int | List]):
+        if type(serialized_form) is not dict:
+            raise TypeError
+        return BoardDelta(
+            serialized_form["base"],
+            serialized_form["version"],
+            list(serialized_form["placed"]),
+            [(x, y) for x, y in serialized_form["removed"]],
+        )
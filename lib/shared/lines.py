@@ -0,0 +1,159 @@
+from typing import Final, Iterator, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .internal_structures import Board, LineMask, Placement, Tile
+
+
+class Line:
+    """Lightweight view of a contiguous line of tiles on the board
+
+    Holds the cell bytes of the line rather than Tile or Placement
+    objects; placements are only created when the line is iterated.
+    The cell at index skip (usually the cell the line was extracted
+    around) is excluded from the line's length and iteration.
+
+    Attributes:
+        run: cell bytes of the whole run, including the skipped cell
+        x_start: x coordinate of the first cell of the run
+        y_start: y coordinate of the first cell of the run
+        horizontal: whether the line runs along the x axis
+        skip: index of the excluded cell within cells, -1 if there is none
+    """
+
+    MAX_LENGTH: Final[int] = LineMask.MAX_LENGTH
+    __slots__ = ("__cells", "__x_start", "__y_start", "__horizontal", "__skip")
+    __cells: npt.NDArray[np.uint8]
+    __x_start: int
+    __y_start: int
+    __horizontal: bool
+    __skip: int
+
+    def __init__(
+        self,
+        cells: npt.NDArray[np.uint8],
+        x_start: int,
+        y_start: int,
+        horizontal: bool,
+        skip: int = -1,
+    ) -> None:
+        self.__cells = cells
+        self.__x_start = x_start
+        self.__y_start = y_start
+        self.__horizontal = horizontal
+        self.__skip = skip
+
+    @property
+    def cells(self) -> npt.NDArray[np.uint8]:
+        """Cell bytes of the tiles in the line, excluding the skipped cell"""
+        if self.__skip < 0:
+            return self.__cells
+        return np.delete(self.__cells, self.__skip)
+
+    @property
+    def run(self) -> npt.NDArray[np.uint8]:
+        """Cell bytes of the whole run, including the skipped cell"""
+        return self.__cells
+
+    @property
+    def horizontal(self) -> bool:
+        return self.__horizontal
+
+    @property
+    def start(self) -> Tuple[int, int]:
+        """Coordinates of the first cell of the run"""
+        return self.__x_start, self.__y_start
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """Coordinates of the cell at the given index of the run"""
+        if self.__horizontal:
+            return self.__x_start + index, self.__y_start
+        return self.__x_start, self.__y_start + index
+
+    @property
+    def mask(self) -> LineMask:
+        """Bitmask summary of the tiles in the line, excluding the skipped cell"""
+        return LineMask.from_cells(self.cells.tolist())
+
+    def has_temporary(self) -> bool:
+        """Checks whether any tile in the line, bar the skipped cell, is temporary"""
+        return bool(np.any(self.cells & Tile.TEMPORARY_BIT))
+
+    def __len__(self) -> int:
+        return len(self.__cells) - (self.__skip >= 0)
+
+    def __iter__(self) -> Iterator[Placement]:
+        for index, cell in enumerate(self.__cells.tolist()):
+            if index != self.__skip:
+                x, y = self.position(index)
+                yield Placement(Tile.from_cell(cell), x, y)
+
+    def __repr__(self) -> str:
+        return "Line(%s)" % ", ".join(repr(placement) for placement in self)
+
+
+def extract_lines(placement: Placement, board: Board) -> Tuple[Line, Line]:
+    """Extracts the lines running through a placement
+
+    The placement's own cell is treated as occupied whether or not the
+    tile is already on the board.
+
+    Args:
+        placement: placement to extract the lines for
+        board: contains the game board
+
+    Returns:
+        Tuple of horizontal and vertical lines through the placement,
+        each of which skips the placement's own cell. A line is None
+        if the neighbouring tiles alone are longer than a line may be.
+    """
+    return (
+        extract_line(placement.x_coord, placement.y_coord, board, True),
+        extract_line(placement.x_coord, placement.y_coord, board, False),
+    )
+
+
+def extract_line(x: int, y: int, board: Board, horizontal: bool) -> Line:
+    """Extracts the line running through a cell along one axis
+
+    Reads the row or column segment around the cell as a NumPy array and
+    finds the contiguous run of tiles on each side of it. The cell itself
+    is treated as occupied whether or not a tile is placed there.
+
+    Args:
+        x: x coordinate of the cell
+        y: y coordinate of the cell
+        board: contains the game board
+        horizontal: whether to extract the line along the x axis
+
+    Returns:
+        Line through the cell which skips the cell itself, or None if the
+        neighbouring tiles alone are longer than a line may be.
+    """
+    reach = Line.MAX_LENGTH
+    if horizontal:
+        segment = board.get_row(y, x - reach, x + reach + 1)
+    else:
+        segment = board.get_column(x, y - reach, y + reach + 1)
+    before = _run_length(segment[reach - 1 :: -1])
+    after = _run_length(segment[reach + 1 :])
+    if before + after >= Line.MAX_LENGTH:
+        return None
+    if horizontal:
+        x -= before
+    else:
+        y -= before
+    return Line(
+        segment[reach - before : reach + after + 1],
+        x,
+        y,
+        horizontal,
+        before,
+    )
+
+
+def _run_length(cells: npt.NDArray[np.uint8]) -> int:
+    """Number of occupied cells at the start of the given cells"""
+    empty = np.flatnonzero(cells == 0)
+    return int(empty[0]) if empty.size else cells.size
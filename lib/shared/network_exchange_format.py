@@ -2,10 +2,11 @@ from enum import IntFlag
 import json
 from typing import Any, Dict, Final, List
 
-from .internal_structures import JsonableObject
+from .internal_structures import JSONABLE_TYPES, JsonableObject
 from .internal_structures import Tile
 from .internal_structures import Placement
 from .internal_structures import Board
+from .internal_structures import BoardDelta
 
 
 class JsonableEncoder(json.JSONEncoder):
@@ -18,36 +19,39 @@ class JsonableEncoder(json.JSONEncoder):
 
 
 class JsonableDecoder(json.JSONDecoder):
-    """Custom JSON Decoder for Jsonable Objects"""
+    """Custom JSON Decoder for Jsonable Objects
+
+    Dictionaries are turned into objects by the json_deserialize of the
+    JsonableObject subclass registered for their "type" (see
+    JSONABLE_TYPES), found with a single lookup. Dictionaries without a
+    registered type are left as they are.
+    """
 
     def __init__(self, *args, **kwargs):
         json.JSONDecoder.__init__(self, *args, object_hook=self.object_hook, **kwargs)
 
-    def object_hook(self, dct: Dict[str, Any]):
-        if "type" in dct.keys():
-            if dct["type"] == Tile.JSONABLE_TYPE:
-                return Tile.json_deserialize(dct)
-            elif dct["type"] == Placement.JSONABLE_TYPE:
-                return Placement.json_deserialize(dct)
-            elif dct["type"] == Board.JSONABLE_TYPE:
-                return Board.json_deserialize(dct)
-            elif dct["type"] == ClientRequest.JSONABLE_TYPE:
-                return ClientRequest.json_deserialize(dct)
-            elif dct["type"] == ServerResponse.JSONABLE_TYPE:
-                return ServerResponse.json_deserialize(dct)
-        else:
+    @staticmethod
+    def object_hook(dct: Dict[str, Any]):
+        try:
+            deserialize = JSONABLE_TYPES.get(dct.get("type"))
+        except TypeError:  # Unhashable "type"
             return dct
+        return dct if deserialize is None else deserialize(dct)
 
 
 class ClientRequest(JsonableObject):
-    """Python Representation of Request from Client"""
+    """Python Representation of Request from Client
+
+    A "resync" request, with no data, asks the server for a full board
+    after a BoardDelta could not be applied.
+    """
 
     JSONABLE_TYPE: Final[str] = "request"
     __request_type: str
     __data: List[Tile] | List[Placement]
 
     def __init__(self, request_type: str, data: List[Placement] | List[Tile]):
-        if request_type in ["discard", "placement"]:
+        if request_type in ["discard", "placement", "resync"]:
             self.__request_type = request_type
             self.__data = data
         else:
@@ -71,6 +75,7 @@ class ClientRequest(JsonableObject):
         }
         return dict_form
 
+    @staticmethod
     def json_deserialize(
         serialized_form: Dict[str, str | List[Placement] | List[Tile]]
     ):
@@ -81,14 +86,20 @@ class ClientRequest(JsonableObject):
 
 
 class ServerResponse(JsonableObject):
-    """Python Representation of Response from Server"""
+    """Python Representation of Response from Server
+
+    A response carries either the full board, on joining or resyncing,
+    or a BoardDelta from the last board the client received, in which
+    case curr_board is None.
+    """
 
     JSONABLE_TYPE: Final[str] = "response"
     __flag: "ServerResponse.ResponseFlag"
     __curr_hand: List[Tile]
-    __curr_board: Board
+    __curr_board: Board | None
+    __delta: BoardDelta | None
     __user_id: int
-    __scores: int
+    __scores: List[int]
 
     def __init__(
         self,
@@ -102,8 +113,9 @@ class ServerResponse(JsonableObject):
         game_over: bool = False,
         winner: bool = False,
         flag: int = -1,
+        delta: BoardDelta | None = None,
     ) -> None:
-        self.__flag = (
+        self.__flag = ServerResponse.ResponseFlag(
             (
                 (ServerResponse.ResponseFlag.VALID if valid else 0)
                 | (ServerResponse.ResponseFlag.FIRST if first else 0)
@@ -112,17 +124,23 @@ class ServerResponse(JsonableObject):
                 | (ServerResponse.ResponseFlag.WINNER if winner else 0)
             )
             if flag < 0
-            else ServerResponse.ResponseFlag(flag)
+            else flag
         )
         self.__curr_hand = hand
         self.__curr_board = board
+        self.__delta = delta
         self.__user_id = user_id
         self.__scores = scores
 
     @property
-    def valid(self):
+    def flag(self) -> "ServerResponse.ResponseFlag":
+        """Flags set on this response"""
+        return self.__flag
+
+    @property
+    def valid(self) -> bool:
         """Indicates whether the latest request was valid."""
-        return self.__valid
+        return ServerResponse.ResponseFlag.VALID in self.__flag
 
     @property
     def curr_hand(self):
@@ -133,6 +151,21 @@ class ServerResponse(JsonableObject):
         """Gets current state of board"""
         return self.__curr_board
 
+    @property
+    def delta(self):
+        """Changes to the board since the last response, if sent as a delta"""
+        return self.__delta
+
+    @property
+    def user_id(self):
+        """Index of the receiving client's score in scores"""
+        return self.__user_id
+
+    @property
+    def scores(self):
+        """Scores of every player"""
+        return self.__scores
+
     @property
     def curr_score(self):
         """Gets current score."""
@@ -147,15 +180,19 @@ class ServerResponse(JsonableObject):
             "user_id": self.__user_id,
             "scores": self.__scores,
         }
+        if self.__delta is not None:
+            dict_form["delta"] = self.__delta
         return dict_form
 
+    @staticmethod
     def json_deserialize(serialized_form: Dict[str, List[Tile] | Board | int]):
         return ServerResponse(
             serialized_form["curr_hand"],
-            serialized_form["curr_board"],
+            serialized_form.get("curr_board"),
             serialized_form["user_id"],
             serialized_form["scores"],
             flag=serialized_form["flag"],
+            delta=serialized_form.get("delta"),
         )
 
     class ResponseFlag(IntFlag):
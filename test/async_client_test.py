@@ -0,0 +1,151 @@
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+
+from lib.shared.framing import FrameBuffer, encode_frame
+from lib.shared.internal_structures import *
+from lib.shared.network_exchange_format import (
+    ClientRequest,
+    JsonableDecoder,
+    JsonableEncoder,
+    ServerResponse,
+)
+from lib.frontend.async_client import AsyncClientSocket, _ServerResponseProtocol
+
+
+def make_response(user_id: int) -> ServerResponse:
+    board = Board()
+    board.add_tile(Placement(Tile(TileColor.BLUE, TileShape.SQUARE, False), 0, 0))
+    return ServerResponse(
+        [None] * 6, board, user_id, list(range(user_id + 1)), valid=True
+    )
+
+
+async def echo_ids(framed: bool, clients: int):
+    """Server answering each request with two responses, then hanging up"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if framed:
+            frames = FrameBuffer()
+            while True:
+                frames.feed(await reader.read(4096))
+                requests = [bytes(payload) for payload in frames.frames()]
+                if len(requests) != 0:
+                    break
+            request = json.loads(requests[0], cls=JsonableDecoder)
+        else:
+            request = json.loads(await reader.read(4096), cls=JsonableDecoder)
+        user_id = request[0].x_coord
+        payload = json.dumps(make_response(user_id), cls=JsonableEncoder).encode()
+        # Split the responses across writes so they straddle reads
+        data = (encode_frame(payload) if framed else payload) * 2
+        for start in range(0, len(data), 100):
+            writer.write(data[start : start + 100])
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+
+    async def play(user_id: int):
+        client = await AsyncClientSocket.connect(host, port, framed)
+        tile = Tile(TileColor.RED, TileShape.CIRCLE)
+        client.send_data(ClientRequest("placement", [Placement(tile, user_id, 0)]))
+        responses = [response async for response in client]
+        assert client.closed
+        return responses
+
+    async with server:
+        return await asyncio.gather(*(play(user_id) for user_id in range(clients)))
+
+
+@pytest.mark.parametrize("framed", [False, True])
+def test_async_client(framed: bool):
+    results = asyncio.run(echo_ids(framed, 50))
+    for user_id, responses in enumerate(results):
+        assert len(responses) == 2
+        assert all(response.curr_score == user_id for response in responses)
+        assert responses[0].curr_board == make_response(user_id).curr_board
+
+
+class FakeTransport:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+async def feed_text(data: bytes, chunk_size: int, framed: bool = False):
+    """Feeds data to a protocol in chunks, returning what it decoded"""
+    protocol = _ServerResponseProtocol(framed)
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    for start in range(0, len(data), chunk_size):
+        protocol.data_received(data[start : start + chunk_size])
+    responses = list()
+    while not protocol.responses.empty():
+        responses.append(protocol.responses.get_nowait())
+    return responses, transport.closed
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_unframed_chunks(monkeypatch, chunk_size: int):
+    boards = list()
+    deserialize = JSONABLE_TYPES[Board.JSONABLE_TYPE]
+    monkeypatch.setitem(
+        JSONABLE_TYPES,
+        Board.JSONABLE_TYPE,
+        lambda dct: boards.append(deserialize(dct)) or boards[-1],
+    )
+    # Unknown keys are ignored, and the brackets in their strings must be too
+    tricky = make_response(4).json_serialize()
+    tricky["note"] = {"text": '}{ "\\ [', "list": [{"a": "]"}]}
+    data = (
+        json.dumps(make_response(3), cls=JsonableEncoder)
+        + "\n"
+        + json.dumps(tricky, cls=JsonableEncoder)
+    ).encode()
+    responses, closed = asyncio.run(feed_text(data, chunk_size))
+    assert not closed
+    assert [response.curr_score for response in responses] == [3, 4]
+    # Each board is decoded once, however many reads the response spans
+    assert len(boards) == 2
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"}",
+        b'{"a": 1]',
+        b'{"a": nope}',
+        b'{"a": 1}',
+        b"[1, 2]",
+        b'{"type": "response", "flag": 5}',
+        b'{"type": "tile", "tile_type": 17, "temporary": false}',
+    ],
+)
+def test_unframed_invalid(data: bytes):
+    responses, closed = asyncio.run(feed_text(data, 4096))
+    assert responses == []
+    assert closed
+
+
+@pytest.mark.parametrize("payload", [b"[1, 2]", b'{"type": "response"}'])
+def test_framed_invalid(payload: bytes):
+    data = encode_frame(json.dumps(make_response(1), cls=JsonableEncoder).encode())
+    responses, closed = asyncio.run(
+        feed_text(data + encode_frame(payload), 4096, framed=True)
+    )
+    assert [response.curr_score for response in responses] == [1]
+    assert closed
+
+
+def test_async_client_without_pygame():
+    code = "import sys, lib.frontend.async_client; print('pygame' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,80 @@
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.shared.gamerules import Gamerules, MoveError
+from lib.analysis.audit import GameAuditor, audit_game, audit_moves
+from lib.analysis.simulator import Simulator, greedy_policy, random_policy
+
+
+@pytest.fixture(scope="module")
+def records():
+    simulator = Simulator([greedy_policy, random_policy])
+    return [simulator.play_game(seed) for seed in range(4)]
+
+
+def test_audit_game(records):
+    for record in records:
+        audit = audit_game(record.turns)
+        assert audit.ok
+        totals = audit.totals(2)
+        assert sum(record.scores) - sum(totals) in (0, Simulator.FINISH_BONUS)
+
+
+def test_audit_claims(records):
+    turns = records[0].turns
+    claimed = [turn.score for turn in audit_game(turns).turns]
+    assert audit_game(turns, claimed).ok
+    claimed[0] += 1
+    audit = audit_game(turns, claimed)
+    assert not audit.ok
+    assert [turn.turn for turn in audit.failures] == [0]
+
+
+def test_audit_illegal_move():
+    red_circle = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    blue_star = Tile(TileColor.BLUE, TileShape.STAR, False)
+    turns = [
+        [Placement(red_circle, 108, 108)],
+        [Placement(blue_star, 109, 108)],
+        None,
+        [Placement(red_circle, 108, 109)],
+    ]
+    audit = audit_game(turns)
+    assert [turn.ok for turn in audit.turns] == [True, False, True, False]
+    assert audit.turns[1].validation.reason == MoveError.MISMATCHED_TILE
+    assert audit.turns[3].validation.reason == MoveError.DUPLICATE_TILE
+    assert audit.totals(2) == [1, 0]
+    assert audit.turns[2].score == 0
+
+
+def test_audit_pass_claims():
+    move = [Placement(Tile(TileColor.RED, TileShape.CIRCLE, False), 0, 0)]
+    assert audit_game([move, None], claimed=[1, 0]).ok
+    assert not audit_game([move, None], claimed=[1, 2]).ok
+
+
+def test_audit_moves(records):
+    board = Board()
+    pairs = list()
+    for move in records[0].turns:
+        if move is not None:
+            pairs.append((board, move))
+            board = board.fork()
+            for placement in move:
+                board.add_tile(placement)
+    rules = Gamerules()
+    audits = audit_moves(pairs)
+    assert all(audit.ok for audit in audits)
+    assert [audit.score for audit in audits] == [
+        rules.score_move(move, board) for board, move in pairs
+    ]
+
+
+def test_game_auditor(records):
+    games = [(record.turns, None) for record in records]
+    with GameAuditor(2) as auditor:
+        parallel = auditor.audit_games(games)
+    serial = GameAuditor(1).audit_games(games)
+    assert [audit.totals(2) for audit in parallel] == [
+        audit.totals(2) for audit in serial
+    ]
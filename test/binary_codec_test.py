@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from lib.shared import binary_codec
+from lib.shared.framing import FrameBuffer, encode_frame
+from lib.shared.internal_structures import *
+from lib.shared.network_exchange_format import ClientRequest, ServerResponse
+from lib.frontend.async_client import AsyncClientSocket
+
+RED_STAR = Tile(TileColor.RED, TileShape.STAR, False)
+BLUE_STAR = Tile(TileColor.BLUE, TileShape.STAR)
+
+
+def make_board() -> Board:
+    board = Board()
+    board.add_tile(Placement(RED_STAR, -5, 100000))
+    board.add_tile(Placement(BLUE_STAR, -5, 100001))
+    return board
+
+
+def round_trip(obj):
+    return binary_codec.decode(binary_codec.encode(obj))
+
+
+@pytest.mark.parametrize("tile", [RED_STAR, BLUE_STAR])
+def test_tile(tile: Tile):
+    assert round_trip(tile) is tile
+
+
+def test_placement():
+    assert round_trip(Placement(BLUE_STAR, -3, 7)) == Placement(BLUE_STAR, -3, 7)
+
+
+@pytest.mark.parametrize("version", [0, 12])
+def test_board(version: int):
+    board = Board.from_cells(make_board().cells(), version)
+    decoded = round_trip(board)
+    assert decoded == board
+    assert decoded.version == version
+    assert round_trip(Board()) == Board()
+
+
+def test_board_delta():
+    delta = BoardDelta(3, 4, [Placement(RED_STAR, 0, 1)], [(2, -2), (3, 3)])
+    decoded = round_trip(delta)
+    assert (decoded.base_version, decoded.version) == (3, 4)
+    assert decoded.placed == delta.placed
+    assert decoded.removed == delta.removed
+
+
+@pytest.mark.parametrize(
+    "request_type, data",
+    [
+        ("discard", [RED_STAR, BLUE_STAR]),
+        ("placement", [Placement(RED_STAR, 1, 2), Placement(BLUE_STAR, 1, 3)]),
+        ("resync", []),
+    ],
+)
+def test_request(request_type: str, data):
+    decoded = round_trip(ClientRequest(request_type, data))
+    assert decoded.request_type == request_type
+    assert list(decoded) == data
+
+
+def test_response():
+    delta = BoardDelta(1, 2, [Placement(RED_STAR, 0, 0)], [])
+    response = ServerResponse(
+        [RED_STAR, None, BLUE_STAR, None, None, None],
+        make_board(),
+        1,
+        [10, 25],
+        valid=True,
+        start_turn=True,
+        delta=delta,
+    )
+    decoded = round_trip(response)
+    assert decoded.json_serialize()["flag"] == response.json_serialize()["flag"]
+    assert decoded.curr_hand == response.curr_hand
+    assert decoded.curr_board == response.curr_board
+    assert decoded.curr_score == 25
+    assert decoded.delta.placed == delta.placed
+    assert round_trip(ServerResponse([None] * 6, None, 0, [0])).curr_board is None
+
+
+@pytest.mark.parametrize("cell", [0x07, 0x40, 0x99])
+def test_response_invalid_hand(cell: int):
+    encoded = bytearray(binary_codec.encode(ServerResponse([None] * 6, None, 0, [0])))
+    # The hand follows the message type and the response header
+    encoded[9] = cell
+    with pytest.raises(ValueError):
+        binary_codec.decode(encoded)
+
+
+@pytest.mark.parametrize("cut", [1, 5, -1])
+def test_truncated(cut: int):
+    encoded = binary_codec.encode(make_board())
+    with pytest.raises(ValueError):
+        binary_codec.decode(encoded[:cut])
+    with pytest.raises(ValueError):
+        binary_codec.decode(encoded + b"\0")
+
+
+@pytest.mark.parametrize(
+    "supported", [[binary_codec.BINARY_CODEC, binary_codec.JSON_CODEC], []]
+)
+def test_handshake(supported):
+    async def run():
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            frames = FrameBuffer()
+
+            async def read_frame() -> bytes:
+                while True:
+                    for payload in frames.frames():
+                        return bytes(payload)
+                    frames.feed(await reader.read(4096))
+
+            offered = binary_codec.parse_hello(await read_frame())["codecs"]
+            reply = binary_codec.hello_reply(offered, supported)
+            writer.write(encode_frame(reply))
+            codec = binary_codec.parse_hello(reply)["codec"]
+            if codec == binary_codec.BINARY_CODEC:
+                request = binary_codec.decode(await read_frame())
+                response = binary_codec.encode(
+                    ServerResponse(list(request), make_board(), 0, [1])
+                )
+            else:
+                response = b'{"type": "response", "flag": 0, "curr_hand": [],'
+                response += b' "curr_board": null, "user_id": 0, "scores": [1]}'
+            writer.write(encode_frame(response))
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        async with server:
+            client = await AsyncClientSocket.connect(
+                *server.sockets[0].getsockname()[:2], binary=True
+            )
+            client.send_data(ClientRequest("discard", [RED_STAR]))
+            return client.codec, [response async for response in client]
+
+    codec, responses = asyncio.run(run())
+    assert len(responses) == 1
+    if len(supported) != 0:
+        assert codec == binary_codec.BINARY_CODEC
+        assert responses[0].curr_hand == [RED_STAR]
+        assert responses[0].curr_board == make_board()
+    else:
+        assert codec == binary_codec.JSON_CODEC
+        assert responses[0].curr_score == 1
@@ -0,0 +1,186 @@
+import pytest
+
+from lib.shared.internal_structures import *
+
+
+@pytest.mark.parametrize("temp", [True, False])
+@pytest.mark.parametrize("x", [-300, -1, 0, 108, 216, 5000])
+@pytest.mark.parametrize("y", [-300, -1, 0, 108, 216, 5000])
+def test_board_add_remove(temp: bool, x: int, y: int):
+    test_board = Board()
+    test_tile = Tile(TileColor.ORANGE, TileShape.STAR, temp)
+    test_board.add_tile(Placement(test_tile, x, y))
+    assert test_board.get_tile(x, y) == test_tile
+    assert test_board.get_tile(x, y).is_temporary() == temp
+    assert test_board.remove_tile(x, y) == test_tile
+    assert test_board.get_tile(x, y) is None
+    assert test_board == Board()
+
+
+def test_board_add_occupied():
+    test_board = Board()
+    first_tile = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    test_board.add_tile(Placement(first_tile, 50, 60))
+    test_board.add_tile(Placement(Tile(TileColor.BLUE, TileShape.CLUB), 50, 60))
+    assert test_board.get_tile(50, 60) == first_tile
+
+
+def test_board_get_board():
+    test_board = Board()
+    test_tile = Tile(TileColor.GREEN, TileShape.CROSS, False)
+    test_board.add_tile(Placement(test_tile, 216, 17))
+    test_board.add_tile(Placement(test_tile, 217, 17))
+    dense = test_board.get_board()
+    assert dense.shape == (Board.ROW, Board.COLUMN)
+    assert dense[17, 216] == test_tile.cell_value
+    assert dense.sum() == test_tile.cell_value
+
+
+def test_board_index():
+    test_board = Board()
+    test_tile = Tile(TileColor.YELLOW, TileShape.SQUARE, False)
+    positions = [(3, 4), (-7, 10), (20, 2), (5, -1)]
+    for x, y in positions:
+        test_board.add_tile(Placement(test_tile, x, y))
+    assert len(test_board) == len(positions)
+    assert set(test_board.positions()) == set(positions)
+    assert all(placement.tile == test_tile for placement in test_board)
+    assert (5, -1) in test_board
+    assert test_board.bounds == (-7, -1, 20, 10)
+    test_board.remove_tile(-7, 10)
+    test_board.remove_tile(5, -1)
+    assert test_board.bounds == (3, 2, 20, 4)
+    test_board.remove_tile(3, 4)
+    test_board.remove_tile(20, 2)
+    assert len(test_board) == 0
+    assert test_board.bounds is None
+
+
+def test_board_fingerprint():
+    first_board = Board()
+    second_board = Board()
+    red_circle = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    red_star = Tile(TileColor.RED, TileShape.STAR, False)
+    first_board.add_tile(Placement(red_circle, 1, 0))
+    first_board.add_tile(Placement(red_star, 2, 0))
+    second_board.add_tile(Placement(red_star, 2, 0))
+    second_board.add_tile(Placement(red_circle, 1, 0))
+    assert first_board.fingerprint == second_board.fingerprint
+    assert first_board == second_board
+    second_board.remove_tile(1, 0)
+    second_board.add_tile(Placement(red_circle.as_temporary(), 1, 0))
+    assert first_board.fingerprint != second_board.fingerprint
+    assert first_board != second_board
+    first_board.remove_tile(1, 0)
+    first_board.remove_tile(2, 0)
+    assert first_board.fingerprint == Board().fingerprint == 0
+
+
+def test_board_fork():
+    base_board = Board()
+    red_circle = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    red_star = Tile(TileColor.RED, TileShape.STAR)
+    base_board.add_tile(Placement(red_circle, 1, 0))
+    forked_board = base_board.fork()
+    assert forked_board == base_board
+    forked_board.add_tile(Placement(red_star, 2, 0))
+    base_board.remove_tile(1, 0)
+    assert base_board.get_tile(2, 0) is None
+    assert forked_board.get_tile(1, 0) is red_circle
+    assert forked_board.get_tile(2, 0) is red_star
+    assert forked_board.get_board()[0, 1] == red_circle.cell_value
+    assert base_board.get_board().sum() == 0
+    assert len(base_board) == 0 and len(forked_board) == 2
+
+
+def test_board_fork_without_frontier():
+    base_board = Board()
+    base_board.add_tile(Placement(Tile(TileColor.RED, TileShape.CIRCLE), 1, 0))
+    before = sorted(base_board.frontier())
+    forked_board = base_board.fork(frontier=False)
+    forked_board.add_tile(Placement(Tile(TileColor.RED, TileShape.STAR), 2, 0))
+    assert sorted(base_board.frontier()) == before
+    expected = base_board.fork()
+    expected.add_tile(Placement(Tile(TileColor.RED, TileShape.STAR), 2, 0))
+    # Rebuilt from the tiles when first queried
+    assert sorted(forked_board.frontier()) == sorted(expected.frontier())
+
+
+def test_board_snapshot():
+    base_board = Board()
+    red_circle = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    base_board.add_tile(Placement(red_circle, 1, 0))
+    snapshot = base_board.snapshot()
+    assert snapshot.frozen and snapshot.snapshot() is snapshot
+    with pytest.raises(TypeError):
+        snapshot.remove_tile(1, 0)
+    base_board.remove_tile(1, 0)
+    assert snapshot.get_tile(1, 0) is red_circle
+    resumed_board = snapshot.fork()
+    resumed_board.add_tile(Placement(red_circle, 2, 0))
+    assert len(snapshot) == 1 and len(resumed_board) == 2
+
+
+def test_board_delta():
+    red_circle = Tile(TileColor.RED, TileShape.CIRCLE, False)
+    red_star = Tile(TileColor.RED, TileShape.STAR, False)
+    blue_star = Tile(TileColor.BLUE, TileShape.STAR, False)
+    old = Board()
+    old.add_tile(Placement(red_circle, 0, 0))
+    old.add_tile(Placement(red_star, 1, 0))
+    new = Board()
+    new.add_tile(Placement(red_circle, 0, 0))
+    new.add_tile(Placement(blue_star, 0, 1))
+    delta = BoardDelta.between(old, new)
+    assert (delta.base_version, delta.version) == (0, 1)
+    assert delta.removed == [(1, 0)]
+    assert delta.placed == [Placement(blue_star, 0, 1)]
+
+    view = old.fork()
+    old.apply_delta(delta)
+    assert old == new
+    assert old.version == 1
+    assert len(view) == 2 and view.version == 0
+    with pytest.raises(ValueError):
+        old.apply_delta(delta)
+    with pytest.raises(TypeError):
+        view.snapshot().apply_delta(delta)
+
+
+@pytest.mark.parametrize("version", [0, 3])
+def test_board_from_arrays(version: int):
+    board = Board()
+    for placement in [
+        Placement(Tile(TileColor.RED, TileShape.CIRCLE, False), -20, 7),
+        Placement(Tile(TileColor.RED, TileShape.STAR), -19, 7),
+        Placement(Tile(TileColor.BLUE, TileShape.STAR, False), -19, 8),
+        Placement(Tile(TileColor.GREEN, TileShape.CLUB, False), 4000, -4000),
+    ]:
+        board.add_tile(placement)
+    xs, ys, cells = zip(*board.cells())
+    built = Board.from_arrays(xs, ys, cells, version)
+    assert built == board
+    assert built.fingerprint == board.fingerprint
+    assert built.bounds == board.bounds
+    assert built.version == version
+    assert (built.get_board() == board.get_board()).all()
+    assert sorted(built.frontier()) == sorted(board.frontier())
+    extra = Placement(Tile(TileColor.RED, TileShape.SQUARE), -21, 7)
+    built.add_tile(extra)
+    board.add_tile(extra)
+    assert sorted(built.frontier()) == sorted(board.frontier())
+
+
+@pytest.mark.parametrize(
+    "xs, ys, cells",
+    [
+        ([0, 1], [0], [0x11, 0x12]),
+        ([0, 0], [0, 0], [0x11, 0x12]),
+        ([0], [0], [0x77]),
+        ([1.9], [0], [0x11]),
+        ([0], [True], [0x11]),
+    ],
+)
+def test_board_from_arrays_invalid(xs, ys, cells):
+    with pytest.raises(ValueError):
+        Board.from_arrays(xs, ys, cells)
@@ -0,0 +1,32 @@
+import random
+from typing import Callable
+
+import pytest
+
+from lib.shared.internal_structures import Board, Placement, Tile, TileColor, TileShape
+from lib.shared.gamerules import Gamerules
+
+
+def build_random_board(seed: int, turns: int) -> Board:
+    rng = random.Random(seed)
+    tiles = [Tile(color, shape) for color in TileColor for shape in TileShape]
+    board = Board()
+    rules = Gamerules()
+    for _ in range(turns):
+        moves = rules.legal_moves(rng.sample(tiles, 6), board)
+        if len(moves) != 0:
+            for placement in rng.choice(moves):
+                board.add_tile(
+                    Placement(
+                        placement.tile.as_permanent(),
+                        placement.x_coord,
+                        placement.y_coord,
+                    )
+                )
+    return board
+
+
+@pytest.fixture
+def random_board() -> Callable[[int, int], Board]:
+    """Builds a legal board by playing random moves from random hands"""
+    return build_random_board
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.shared.gamerules import Gamerules
+from lib.analysis.endgame import EndgameSolver
+
+
+def minimax(board: Board, hand, opponent_hand, passed: bool) -> int:
+    rules = Gamerules()
+    moves = rules.legal_moves(hand, board)
+    if len(moves) == 0:
+        return 0 if passed else -minimax(board, opponent_hand, hand, True)
+    best = None
+    for move in moves:
+        score = rules.score_move(move, board)
+        remaining = list(hand)
+        for placement in move:
+            remaining.remove(placement.tile)
+        if len(remaining) == 0:
+            value = score + EndgameSolver.FINISH_BONUS
+        else:
+            child = board.fork()
+            for placement in move:
+                child.add_tile(placement)
+            value = score - minimax(child, opponent_hand, remaining, False)
+        best = value if best is None else max(best, value)
+    return best
+
+
+@pytest.mark.parametrize("seed", [4, 5, 6])
+def test_endgame_exact(seed: int, random_board):
+    board = random_board(seed, 10)
+    tiles = random.Random(seed).sample(
+        [Tile(color, shape, False) for color in TileColor for shape in TileShape], 5
+    )
+    hand, opponent_hand = tiles[:3], tiles[3:]
+    result = EndgameSolver().solve(board, hand, opponent_hand)
+    assert result.exact
+    assert result.value == minimax(board, hand, opponent_hand, False)
+    if result.best_move is not None:
+        assert Gamerules().verify_move(result.best_move, board)
+
+
+def test_endgame_budget(random_board):
+    board = random_board(7, 10)
+    tiles = random.Random(7).sample(
+        [Tile(color, shape, False) for color in TileColor for shape in TileShape], 12
+    )
+    result = EndgameSolver(max_nodes=50).solve(board, tiles[:6], tiles[6:])
+    assert not result.exact
+    assert result.nodes <= 51
@@ -0,0 +1,53 @@
+import json
+import socket
+
+import pytest
+
+from lib.shared.framing import HEADER, FrameBuffer, FrameError, encode_frame
+
+
+def decode(frames: FrameBuffer):
+    return [bytes(payload) for payload in frames.frames()]
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 7, 4096])
+def test_frames_split_and_coalesced(chunk: int):
+    payloads = [b"", b"a", b"hello", bytes(range(256)) * 40]
+    stream = b"".join(encode_frame(payload) for payload in payloads)
+    frames = FrameBuffer(16)
+    received = list()
+    for start in range(0, len(stream), chunk):
+        frames.feed(stream[start : start + chunk])
+        received += decode(frames)
+    assert received == payloads
+    assert len(frames) == 0
+
+
+def test_frame_buffer_reuses_space():
+    frames = FrameBuffer(64)
+    for _ in range(100):
+        frames.feed(encode_frame(b"x" * 40))
+        assert decode(frames) == [b"x" * 40]
+    assert frames.capacity == 64
+
+
+def test_frame_too_large():
+    frames = FrameBuffer(max_frame_size=10)
+    frames.feed(HEADER.pack(11))
+    with pytest.raises(FrameError):
+        decode(frames)
+
+
+def test_recv_into():
+    left, right = socket.socketpair()
+    with left, right:
+        message = json.dumps({"board": ["tile"] * 20000}).encode()
+        left.sendall(encode_frame(message) + encode_frame(b"{}"))
+        left.shutdown(socket.SHUT_WR)
+        frames = FrameBuffer()
+        received = list()
+        while frames.recv_into(right) != 0:
+            received += [
+                json.loads(str(payload, "utf-8")) for payload in frames.frames()
+            ]
+        assert received == [json.loads(message), {}]
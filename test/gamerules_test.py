@@ -0,0 +1,222 @@
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.shared.gamerules import Gamerules, MoveError
+from lib.shared.lines import LineMask
+
+
+def build_board(*placements: Placement) -> Board:
+    board = Board()
+    for placement in placements:
+        board.add_tile(placement)
+    return board
+
+
+RED_CIRCLE = Tile(TileColor.RED, TileShape.CIRCLE, False)
+RED_STAR = Tile(TileColor.RED, TileShape.STAR, False)
+RED_SQUARE = Tile(TileColor.RED, TileShape.SQUARE, False)
+RED_DIAMOND = Tile(TileColor.RED, TileShape.DIAMOND)
+BLUE_CIRCLE = Tile(TileColor.BLUE, TileShape.CIRCLE, False)
+BLUE_STAR = Tile(TileColor.BLUE, TileShape.STAR, False)
+BLUE_SQUARE = Tile(TileColor.BLUE, TileShape.SQUARE, False)
+
+
+@pytest.mark.parametrize("x", [0, 15, 16, -1])
+def test_get_lines(x: int):
+    board = build_board(
+        Placement(RED_CIRCLE, x, 5),
+        Placement(RED_STAR, x + 1, 5),
+        Placement(BLUE_STAR, x + 1, 6),
+    )
+    x_line, y_line = Gamerules().get_lines(
+        Placement(RED_SQUARE.as_temporary(), x + 2, 5), board
+    )
+    assert list(x_line) == [Placement(RED_CIRCLE, x, 5), Placement(RED_STAR, x + 1, 5)]
+    assert len(y_line) == 0
+
+
+def test_get_lines_invalid():
+    board = build_board(
+        Placement(RED_CIRCLE, 0, 0),
+        Placement(BLUE_STAR, 1, 1),
+    )
+    rules = Gamerules()
+    x_line, y_line = rules.get_lines(Placement(RED_CIRCLE, 1, 0), board)
+    assert x_line is None and y_line is None
+    assert not rules.verify_placement(Placement(RED_CIRCLE, 1, 0), board)
+    assert rules.verify_placement(Placement(RED_STAR, 1, 0), board)
+    assert not rules.verify_placement(Placement(RED_STAR, 5, 5), board)
+
+
+def test_get_lines_too_long():
+    board = build_board(
+        *(
+            Placement(Tile(color, TileShape.CLUB, False), x, 0)
+            for x, color in enumerate(TileColor)
+        )
+    )
+    x_line, _ = Gamerules().get_lines(Placement(RED_CIRCLE, 6, 0), board)
+    assert x_line is None
+
+
+@pytest.mark.parametrize(
+    "tiles, extension, expected",
+    [
+        ([], RED_CIRCLE, True),
+        ([RED_CIRCLE], RED_STAR, True),
+        ([RED_CIRCLE], BLUE_CIRCLE, True),
+        ([RED_CIRCLE], BLUE_STAR, False),
+        ([RED_CIRCLE], RED_CIRCLE.as_temporary(), False),
+        ([RED_CIRCLE, RED_STAR], BLUE_CIRCLE, False),
+        ([RED_CIRCLE, BLUE_CIRCLE], BLUE_CIRCLE, False),
+        ([RED_CIRCLE, BLUE_CIRCLE], Tile(TileColor.GREEN, TileShape.CIRCLE), True),
+        ([RED_CIRCLE, BLUE_STAR], RED_STAR, False),
+        ([Tile(TileColor.RED, shape) for shape in TileShape][:5], RED_CIRCLE, False),
+    ],
+)
+def test_line_mask(tiles, extension: Tile, expected: bool):
+    mask = LineMask.from_cells(tile.cell_value for tile in tiles)
+    assert mask.can_extend(extension.cell_value) == expected
+    assert mask.extend(extension.cell_value).valid == expected
+
+
+def test_score_placement():
+    board = build_board(
+        *(
+            Placement(Tile(TileColor.GREEN, shape, False), x, 0)
+            for x, shape in enumerate(list(TileShape)[:5])
+        ),
+        Placement(Tile(TileColor.RED, TileShape.CLUB, False), 5, 1),
+    )
+    green_club = Placement(Tile(TileColor.GREEN, TileShape.CLUB), 5, 0)
+    assert Gamerules().score_placement(green_club, board) == 6 + 6 + 2
+
+
+@pytest.mark.parametrize(
+    "move, reason",
+    [
+        ([], MoveError.EMPTY),
+        ([Placement(BLUE_CIRCLE, 1, 1)], MoveError.OCCUPIED),
+        (
+            [Placement(BLUE_CIRCLE, 3, 1), Placement(BLUE_STAR, 3, 1)],
+            MoveError.OCCUPIED,
+        ),
+        (
+            [Placement(RED_SQUARE, 3, 1), Placement(RED_STAR, 4, 2)],
+            MoveError.NOT_IN_LINE,
+        ),
+        (
+            [Placement(BLUE_STAR, 3, 1), Placement(BLUE_STAR, 5, 1)],
+            MoveError.NOT_CONTIGUOUS,
+        ),
+        (
+            [Placement(BLUE_STAR, 3, 1), Placement(BLUE_STAR, 4, 1)],
+            MoveError.DUPLICATE_TILE,
+        ),
+        ([Placement(RED_STAR, 3, 1)], MoveError.MISMATCHED_TILE),
+        (
+            [Placement(BLUE_STAR, 3, 1), Placement(BLUE_SQUARE, 4, 1)],
+            MoveError.MISMATCHED_TILE,
+        ),
+        ([Placement(BLUE_STAR, 10, 10)], MoveError.NOT_CONNECTED),
+        ([Placement(BLUE_STAR, 2, 2), Placement(BLUE_SQUARE, 2, 3)], None),
+        ([Placement(RED_STAR, 1, 2), Placement(RED_SQUARE, 1, 3)], None),
+    ],
+)
+def test_validate_move(move, reason):
+    board = build_board(
+        Placement(RED_CIRCLE, 1, 1),
+        Placement(BLUE_CIRCLE, 2, 1),
+    )
+    validation = Gamerules().validate_move(move, board)
+    assert validation.reason == reason
+    assert bool(validation) == (reason is None)
+    assert Gamerules().verify_move(move, board) == (reason is None)
+
+
+def test_validate_move_temporary_on_board():
+    move = [Placement(RED_STAR.as_temporary(), 5, 5)]
+    board = build_board(*move)
+    assert Gamerules().validate_move(move, board)
+    board.add_tile(Placement(RED_SQUARE, 5, 6))
+    assert Gamerules().validate_move(move, board)
+    assert not Gamerules().validate_move([Placement(RED_SQUARE, 5, 6)], board)
+
+
+@pytest.mark.parametrize(
+    "move, points",
+    [
+        ([Placement(RED_STAR, 1, 2), Placement(RED_SQUARE, 1, 3)], [3]),
+        ([Placement(BLUE_STAR, 2, 2), Placement(RED_STAR, 1, 2)], [2, 2, 2]),
+        ([Placement(BLUE_STAR, 3, 3), Placement(BLUE_SQUARE, 3, 4)], [2]),
+        ([Placement(BLUE_STAR, 3, 5)], [1]),
+    ],
+)
+def test_score_breakdown(move, points):
+    if move[0].x_coord == 3:  # Scoring an opening move on an empty board
+        board = Board()
+    else:
+        board = build_board(Placement(RED_CIRCLE, 1, 1), Placement(BLUE_CIRCLE, 2, 1))
+    breakdown = Gamerules().score_breakdown(move, board.snapshot())
+    assert sorted(line.points for line in breakdown.lines) == points
+    assert Gamerules().score_move(move, board) == sum(points)
+
+
+def test_score_breakdown_qwirkle():
+    shapes = list(TileShape)
+    board = build_board(
+        *(
+            Placement(Tile(TileColor.VIOLET, shape, False), 0, y)
+            for y, shape in enumerate(shapes[:4])
+        )
+    )
+    move = [
+        Placement(Tile(TileColor.VIOLET, shape), 0, y + 4)
+        for y, shape in enumerate(shapes[4:])
+    ]
+    breakdown = Gamerules().score_breakdown(move, board)
+    assert [line.qwirkle for line in breakdown.lines] == [True]
+    assert breakdown.total == 12
+    with pytest.raises(ValueError):
+        Gamerules().score_move(move[:1] * 2, board)
+
+
+def test_board_frontier():
+    board = build_board(
+        Placement(RED_CIRCLE, 1, 1),
+        Placement(BLUE_CIRCLE, 2, 1),
+        Placement(BLUE_STAR, 2, 2),
+    )
+    board.remove_tile(2, 1)
+    board.add_tile(Placement(RED_STAR, 1, 2))
+    frontier = {(x, y): allowed for x, y, allowed in board.frontier()}
+    x_min, y_min, x_max, y_max = board.bounds
+    for x in range(x_min - 2, x_max + 3):
+        for y in range(y_min - 2, y_max + 3):
+            if (x, y) in board:
+                assert (x, y) not in frontier
+                continue
+            neighbours = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+            assert ((x, y) in frontier) == any(pos in board for pos in neighbours)
+            for tile in [
+                Tile(color, shape) for color in TileColor for shape in TileShape
+            ]:
+                legal = Gamerules().verify_move([Placement(tile, x, y)], board)
+                if (x, y) in frontier:
+                    assert legal == bool(frontier[x, y] & KIND_BITS[tile.cell_value])
+
+
+def test_legal_moves():
+    board = build_board(
+        Placement(RED_CIRCLE, 1, 1),
+        Placement(BLUE_CIRCLE, 2, 1),
+    )
+    hand = [RED_STAR, RED_SQUARE, BLUE_STAR, RED_STAR, RED_DIAMOND, None]
+    moves = Gamerules().legal_moves(hand, board)
+    assert len(moves) == len({frozenset(move) for move in moves})
+    for move in moves:
+        assert Gamerules().verify_move(move, board)
+    assert any(len(move) == 3 for move in moves)
+    assert not any(len(move) > 3 for move in moves)
+    opening = Gamerules().legal_moves(hand, Board())
+    assert max(len(move) for move in opening) == 3
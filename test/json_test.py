@@ -3,6 +3,7 @@ import pytest
 from lib.shared.internal_structures import *
 from lib.shared.network_exchange_format import JsonableEncoder
 from lib.shared.network_exchange_format import JsonableDecoder
+from lib.shared.network_exchange_format import ServerResponse
 
 
 @pytest.mark.parametrize(
@@ -47,7 +48,174 @@ def test_placement_json(color: TileColor, shape: TileShape, x: int, y: int):
 
 def test_board_json():
     base_board = Board()
-    base_board.get_board()[63, 64] = Tile(TileColor.RED, TileShape.DIAMOND)
+    base_board.add_tile(Placement(Tile(TileColor.RED, TileShape.DIAMOND), 64, 63))
     assert base_board == json.loads(
         json.dumps(base_board, cls=JsonableEncoder), cls=JsonableDecoder
     )
+
+
+def test_board_delta_json():
+    old = Board()
+    old.add_tile(Placement(Tile(TileColor.RED, TileShape.DIAMOND), 64, 63))
+    new = Board()
+    new.add_tile(Placement(Tile(TileColor.RED, TileShape.STAR), 65, 63))
+    delta = json.loads(
+        json.dumps(BoardDelta.between(old, new, 7), cls=JsonableEncoder),
+        cls=JsonableDecoder,
+    )
+    old.apply_delta(delta)
+    assert old == new
+    assert old.version == 7
+    assert (
+        json.loads(json.dumps(old, cls=JsonableEncoder), cls=JsonableDecoder).version
+        == 7
+    )
+
+
+def test_board_json_legacy():
+    serialized = json.dumps(
+        {
+            "type": "board",
+            "(64, 63)": Tile(TileColor.RED, TileShape.DIAMOND).json_serialize(),
+            "(-2, 5)": Tile(TileColor.BLUE, TileShape.CLUB, False).json_serialize(),
+        }
+    )
+    board = json.loads(serialized, cls=JsonableDecoder)
+    assert board.get_tile(64, 63) == Tile(TileColor.RED, TileShape.DIAMOND)
+    assert board.get_tile(-2, 5) == Tile(TileColor.BLUE, TileShape.CLUB, False)
+    assert len(board) == 2
+
+
+@pytest.mark.parametrize("key", ["__import__('os')", "(1, 2, 3)", "(a, 1)"])
+def test_board_json_legacy_invalid(key: str):
+    serialized = json.dumps(
+        {"type": "board", key: Tile(TileColor.RED, TileShape.STAR).json_serialize()}
+    )
+    with pytest.raises(ValueError):
+        json.loads(serialized, cls=JsonableDecoder)
+
+
+class Point(JsonableObject):
+    JSONABLE_TYPE: Final[str] = "test_point"
+
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def json_serialize(self):
+        return {"type": Point.JSONABLE_TYPE, "pos": [self.x, self.y]}
+
+    @staticmethod
+    def json_deserialize(serialized_form):
+        return Point(*serialized_form["pos"])
+
+
+def test_decoder_registered_type():
+    tile = Tile(TileColor.RED, TileShape.STAR)
+    decoded = json.loads(
+        json.dumps({"points": [Point(1, 2)], "tile": tile}, cls=JsonableEncoder),
+        cls=JsonableDecoder,
+    )
+    assert type(decoded["points"][0]) is Point
+    assert (decoded["points"][0].x, decoded["points"][0].y) == (1, 2)
+    assert decoded["tile"] == tile
+
+
+@pytest.mark.parametrize(
+    "dct", [{}, {"type": "unknown", "a": 1}, {"type": ["tile"]}, {"type": None}]
+)
+def test_decoder_unregistered_type(dct: dict):
+    assert json.loads(json.dumps(dct), cls=JsonableDecoder) == dct
+
+
+def test_decoder_type_clash():
+    with pytest.raises(ValueError):
+
+        class OtherTile(JsonableObject):
+            JSONABLE_TYPE: Final[str] = Tile.JSONABLE_TYPE
+
+            def json_serialize(self):
+                pass
+
+            @staticmethod
+            def json_deserialize(serialized_form):
+                pass
+
+    assert JSONABLE_TYPES[Tile.JSONABLE_TYPE] is Tile.json_deserialize
+
+
+def test_decoder_type_clash_other_module():
+    # Same name as the registered class, but defined in another module
+    namespace = {"__name__": "other_module", "JsonableObject": JsonableObject}
+    with pytest.raises(ValueError):
+        exec(
+            "class Tile(JsonableObject):\n"
+            "    JSONABLE_TYPE = 'tile'\n"
+            "    def json_serialize(self): pass\n"
+            "    @staticmethod\n"
+            "    def json_deserialize(serialized_form): pass\n",
+            namespace,
+        )
+    assert JSONABLE_TYPES[Tile.JSONABLE_TYPE] is Tile.json_deserialize
+
+
+@pytest.mark.parametrize("valid", [False, True])
+@pytest.mark.parametrize("game_over", [False, True])
+def test_server_response_json(valid: bool, game_over: bool):
+    hand = [Tile(TileColor.RED, TileShape.STAR), None]
+    response = json.loads(
+        json.dumps(
+            ServerResponse(hand, Board(), 1, [4, 9], valid=valid, game_over=game_over),
+            cls=JsonableEncoder,
+        ),
+        cls=JsonableDecoder,
+    )
+    assert response.valid == valid
+    assert (ServerResponse.ResponseFlag.GAME_OVER in response.flag) == game_over
+    assert response.curr_hand == hand
+    assert response.user_id == 1
+    assert response.scores == [4, 9]
+    assert response.curr_score == 9
+
+
+@pytest.mark.parametrize("flag", [-1, 0, 5])
+def test_server_response_flag(flag: int):
+    response = ServerResponse([], Board(), 0, [0], flag=flag)
+    assert type(response.flag) is ServerResponse.ResponseFlag
+    assert response.valid == (flag == 5)
+    assert (ServerResponse.ResponseFlag.START_TURN in response.flag) == (flag == 5)
+
+
+def test_server_response_delta_only():
+    old = Board()
+    new = Board()
+    new.add_tile(Placement(Tile(TileColor.RED, TileShape.STAR), 0, 0))
+    serialized = {
+        "type": ServerResponse.JSONABLE_TYPE,
+        "flag": 0,
+        "curr_hand": [],
+        "user_id": 0,
+        "scores": [0],
+        "delta": BoardDelta.between(old, new, 1),
+    }
+    response = json.loads(
+        json.dumps(serialized, cls=JsonableEncoder), cls=JsonableDecoder
+    )
+    assert response.curr_board is None
+    old.apply_delta(response.delta)
+    assert old == new
+
+
+@pytest.mark.parametrize(
+    "arrays",
+    [
+        {"xs": [1.9], "ys": [0], "tiles": [0x11], "temporary": [0]},
+        {"xs": [1], "ys": ["0"], "tiles": [0x11], "temporary": [0]},
+        {"xs": [1], "ys": [0], "tiles": [0x91], "temporary": [0]},
+        {"xs": [1], "ys": [0], "tiles": [0x11], "temporary": [2]},
+        {"xs": [1], "ys": [0], "tiles": [0x11], "temporary": [0.5]},
+    ],
+)
+def test_board_json_invalid(arrays: dict):
+    with pytest.raises(ValueError):
+        json.loads(json.dumps({"type": "board", **arrays}), cls=JsonableDecoder)
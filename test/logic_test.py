@@ -0,0 +1,43 @@
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.frontend.logic import Logic
+
+
+class FakeSocket:
+    def __init__(self, accept: bool):
+        self.accept = accept
+        self.requests = list()
+
+    def send_data(self, data):
+        if self.accept:
+            self.requests.append(data)
+        return self.accept
+
+
+@pytest.mark.parametrize("accept", [False, True])
+def test_end_turn_discard(accept: bool):
+    logic = Logic()
+    logic.is_curr_turn = True
+    tile = Tile(TileColor.RED, TileShape.STAR)
+    logic.discard_tile(tile, 2)
+    client = FakeSocket(accept)
+    assert logic.end_turn(True, client) == accept
+    assert logic.is_curr_turn != accept
+    if accept:
+        assert list(client.requests[0]) == [tile]
+    else:
+        # The discard is kept, so the turn can be ended again
+        client.accept = True
+        assert logic.end_turn(True, client)
+        assert list(client.requests[0]) == [tile]
+
+
+@pytest.mark.parametrize("accept", [False, True])
+def test_end_turn_placement(accept: bool):
+    logic = Logic()
+    logic.is_curr_turn = True
+    logic.play_tile(Placement(Tile(TileColor.RED, TileShape.STAR), 0, 0))
+    assert logic.end_turn(False, FakeSocket(accept)) == accept
+    assert logic.tile_played() != accept
+    assert logic.request_resync(FakeSocket(accept)) == accept
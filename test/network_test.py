@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import socket
+import time
+from typing import List
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from lib.shared import binary_codec
+from lib.shared.framing import FrameBuffer, encode_frame
+from lib.shared.internal_structures import *
+from lib.shared.network_exchange_format import (
+    ClientRequest,
+    JsonableDecoder,
+    JsonableEncoder,
+    ServerResponse,
+)
+from lib.frontend.frontend_network import (
+    ClientSocket,
+    DataReceivedEvent,
+    GameEndEvent,
+)
+
+
+@pytest.fixture
+def server():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    listener = socket.create_server(("127.0.0.1", 0))
+    yield listener
+    listener.close()
+
+
+def wait_for_events(event_type: int, count: int, timeout: float = 5):
+    events = list()
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        events += pygame.event.get(event_type)
+        time.sleep(0.01)
+    return events
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("framed", [False, True])
+def test_client_socket(server: socket.socket, framed: bool):
+    client = ClientSocket(*server.getsockname(), framed=framed)
+    connection, _ = server.accept()
+    with connection:
+        board = Board()
+        board.add_tile(Placement(Tile(TileColor.RED, TileShape.STAR, False), 4, 5))
+        response = ServerResponse([None] * 6, board, 0, [3], valid=True)
+        payload = json.dumps(response, cls=JsonableEncoder).encode()
+        connection.sendall(encode_frame(payload) * 2 if framed else payload)
+        events = wait_for_events(DataReceivedEvent.EVENTTYPE, 2 if framed else 1)
+        assert all(event.response.curr_board == board for event in events)
+        assert len(events) == (2 if framed else 1)
+
+        client.close()
+        assert wait_until(lambda: client._sock.fileno() == -1)
+        assert connection.recv(1) == b""
+    assert len(wait_for_events(GameEndEvent.EVENTTYPE, 1)) == 1
+
+
+def test_server_disconnect(server: socket.socket):
+    client = ClientSocket(*server.getsockname())
+    connection, _ = server.accept()
+    connection.close()
+    assert len(wait_for_events(GameEndEvent.EVENTTYPE, 1)) == 1
+    assert client.closed
+    assert wait_until(lambda: client._sock.fileno() == -1)
+
+
+@pytest.mark.parametrize(
+    "framed, data",
+    [
+        (False, b"not json"),
+        (True, encode_frame(b"not json")),
+        (True, encode_frame(b"\xff\xfe")),
+        (True, b"\xff\xff\xff\xff"),
+        (False, b'{"type": "response", "flag": 5}'),
+        (True, encode_frame(b'{"type": "response", "flag": 5}')),
+        (False, b"[1, 2]"),
+        (True, encode_frame(b'{"a": 1}')),
+        (True, encode_frame(b'{"type": "tile", "tile_type": 17, "temporary": false}')),
+    ],
+)
+def test_invalid_message(server: socket.socket, framed: bool, data: bytes):
+    client = ClientSocket(*server.getsockname(), framed=framed)
+    connection, _ = server.accept()
+    with connection:
+        connection.sendall(data)
+        assert len(wait_for_events(GameEndEvent.EVENTTYPE, 1)) == 1
+        assert client.closed
+        assert wait_until(lambda: client._sock.fileno() == -1)
+        assert connection.recv(1) == b""
+
+
+def test_client_socket_binary(server: socket.socket):
+    def serve():
+        connection, _ = server.accept()
+        frames = FrameBuffer()
+        payloads = list()
+        while len(payloads) == 0:
+            frames.feed(connection.recv(4096))
+            payloads = [bytes(payload) for payload in frames.frames()]
+        offered = binary_codec.parse_hello(payloads[0])["codecs"]
+        reply = binary_codec.hello_reply(offered, [binary_codec.BINARY_CODEC])
+        response = ServerResponse([None] * 6, Board(), 0, [5], valid=True)
+        connection.sendall(
+            encode_frame(reply) + encode_frame(binary_codec.encode(response))
+        )
+        return connection
+
+    with ThreadPoolExecutor(1) as executor:
+        accepted = executor.submit(serve)
+        client = ClientSocket(*server.getsockname(), binary=True)
+        connection = accepted.result()
+    with connection:
+        assert client.codec == binary_codec.BINARY_CODEC
+        events = wait_for_events(DataReceivedEvent.EVENTTYPE, 1)
+        assert len(events) == 1
+        assert events[0].response.scores == [5]
+        assert events[0].response.valid
+        client.close()
+        assert wait_until(lambda: client._sock.fileno() == -1)
+
+
+def read_frames(connection: socket.socket, count: int) -> List[bytes]:
+    frames = FrameBuffer()
+    payloads = list()
+    while len(payloads) < count:
+        received = frames.recv_into(connection)
+        assert received != 0
+        payloads += [bytes(payload) for payload in frames.frames()]
+    return payloads
+
+
+def test_send_data_burst(server: socket.socket):
+    client = ClientSocket(*server.getsockname(), framed=True, max_queued=1000)
+    connection, _ = server.accept()
+    with connection:
+        assert client._sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+        tiles = [Tile(TileColor.RED, TileShape.STAR, False)] * 6
+        for count in range(1, 201):
+            assert client.send_data(ClientRequest("discard", tiles[: count % 7]))
+        requests = [
+            json.loads(payload, cls=JsonableDecoder)
+            for payload in read_frames(connection, 200)
+        ]
+        assert [len(list(request)) for request in requests] == [
+            count % 7 for count in range(1, 201)
+        ]
+        client.close()
+        assert wait_until(lambda: client._sock.fileno() == -1)
+    assert not client.send_data(ClientRequest("resync", []))
+
+
+def test_send_data_backpressure(server: socket.socket):
+    client = ClientSocket(*server.getsockname(), framed=True, max_queued=2)
+    connection, _ = server.accept()
+    with connection:
+        # Larger than the socket buffers, so the writer blocks until it is read
+        large = ClientRequest(
+            "discard", [Tile(TileColor.RED, TileShape.STAR)] * 2**18
+        )
+        assert client.send_data(large)
+        assert wait_until(lambda: client.pending == 0)
+        assert client.send_data(ClientRequest("resync", []))
+        assert client.send_data(ClientRequest("resync", []))
+        assert not client.send_data(ClientRequest("resync", []))
+        assert client.pending == 2
+
+        requests = [
+            json.loads(payload, cls=JsonableDecoder)
+            for payload in read_frames(connection, 3)
+        ]
+        assert len(list(requests[0])) == 2**18
+        assert [request.request_type for request in requests[1:]] == ["resync"] * 2
+        assert wait_until(lambda: client.pending == 0)
+        assert client.send_data(ClientRequest("resync", []))
+        client.close()
+        assert wait_until(lambda: client._sock.fileno() == -1)
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.shared.gamerules import Gamerules
+from lib.analysis.search import MoveSearch
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_best_moves(seed: int, random_board):
+    board = random_board(seed, 15)
+    hand = random.Random(seed).sample(
+        [Tile(color, shape) for color in TileColor for shape in TileShape], 6
+    )
+    expected = [
+        Gamerules().score_move(move, board)
+        for move in Gamerules().legal_moves(hand, board)
+    ]
+    expected.sort(reverse=True)
+    inline = MoveSearch(1).best_moves(hand, board, 5)
+    with MoveSearch(2) as search:
+        parallel = search.best_moves(hand, board, 5)
+    assert [scored.score for scored in inline] == expected[:5]
+    assert [scored.score for scored in parallel] == expected[:5]
+    for scored in parallel:
+        assert Gamerules().verify_move(scored.move, board)
@@ -0,0 +1,60 @@
+import pytest
+
+from lib.shared.internal_structures import *
+from lib.shared.gamerules import Gamerules
+from lib.analysis.simulator import (
+    Simulator,
+    greedy_policy,
+    new_bag,
+    random_policy,
+)
+
+
+def test_new_bag():
+    bag = new_bag()
+    assert len(bag) == 108
+    assert len(set(bag)) == 36
+
+
+@pytest.mark.parametrize(
+    "policies",
+    [
+        [greedy_policy],
+        [random_policy, greedy_policy],
+        [random_policy, random_policy, greedy_policy],
+    ],
+)
+def test_play_game(policies):
+    record = Simulator(policies).play_game(3)
+    assert len(record.scores) == len(policies)
+    board = Board()
+    rules = Gamerules()
+    scores = [0] * len(policies)
+    for turn, move in enumerate(record.turns):
+        if move is not None:
+            assert rules.verify_move(move, board)
+            scores[turn % len(policies)] += rules.score_move(move, board)
+            for placement in move:
+                board.add_tile(placement)
+    assert len(board) <= 108
+    assert sum(record.scores) - sum(scores) in (0, Simulator.FINISH_BONUS)
+
+
+def test_run():
+    simulator = Simulator([greedy_policy, greedy_policy])
+    report, records = simulator.run(2, 10)
+    assert report.games == 2
+    assert report.moves == sum(record.moves for record in records)
+    assert report.timings["legal_moves"][0] >= report.moves
+    assert [record.scores for record in records] == [
+        record.scores for record in simulator.run(2, 10)[1]
+    ]
+
+
+@pytest.mark.parametrize("players", [1, 2, 4])
+def test_play_game_without_moves(players: int):
+    # Swapping never runs out, so the game must end after a round without moves
+    policies = [lambda rules, hand, board, rng: None] * players
+    record = Simulator(policies).play_game(0)
+    assert record.turns == [None] * players
+    assert record.scores == [0] * players
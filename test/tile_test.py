@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from lib.shared.internal_structures import *
@@ -30,3 +32,24 @@ def test_tile_hex(color: TileColor, shape: TileShape):
     assert test_tile.color == color
     assert test_tile.shape == shape
     assert test_tile.hex_value == color.value ^ shape.value
+
+
+@pytest.mark.parametrize("color", [TileColor.RED, TileColor.BLUE])
+@pytest.mark.parametrize("shape", [TileShape.CIRCLE, TileShape.STAR])
+@pytest.mark.parametrize("temp", [True, False])
+def test_tile_flyweight(color: TileColor, shape: TileShape, temp: bool):
+    test_tile = Tile(color, shape, temp)
+    assert test_tile is Tile(color, shape, temp)
+    assert test_tile is Tile.from_cell(test_tile.cell_value)
+    assert test_tile is pickle.loads(pickle.dumps(test_tile))
+    assert test_tile.as_permanent() is Tile(color, shape, False)
+    assert test_tile.as_temporary() is Tile(color, shape, True)
+    assert len({test_tile, Tile(color, shape, temp), test_tile.as_permanent()}) == (
+        2 if temp else 1
+    )
+
+
+@pytest.mark.parametrize("color, shape", [(0, 0), (0x07, 0x10), (0x01, 0x11)])
+def test_tile_invalid(color: int, shape: int):
+    with pytest.raises(ValueError):
+        Tile(color, shape)
@@ -25,7 +25,7 @@ def tile_img_load(tile: Tile):
     Returns:
         The image of the tile.
     """
-    if tile == 0:
+    if tile is None:
         return None
     fileName = "assets/tile_img/%s-%s.png" % (
         tile.color.name.lower(),
@@ -70,13 +70,20 @@ class View:
     __selected_board_x_y: npt.NDArray[np.int_]
     __is_winner: bool
 
-    def __init__(self, size, g_logic):
-        """Inits the view"""
+    def __init__(self, size, g_logic, interactive: bool = True):
+        """Inits the view
+
+        Args:
+            size: dimensions of the Qwirkle window
+            g_logic: instance of the logic class
+            interactive: whether to connect to a server and run the event loop;
+                a view that is not interactive only renders, e.g. for benchmarks
+        """
         self.__logic = g_logic
         self.__window_size = size
-        self.__socket = View.connect_server()
+        self.__socket = View.connect_server() if interactive else None
         self.__screen = pygame.display.set_mode(size)
-        self.__board = self.__logic.board
+        self.__board = self.__logic.board.fork()
         self.__discarding_tiles = list()
         self.__is_winner = False
         self.__selected_board_tile = None
@@ -88,6 +95,8 @@ class View:
         self.__screen.fill(background_color)
         self.update_view()
         self.render_details()
+        if not interactive:
+            return
         self.render_instructions()  # Fix window geometry before uncommenting
         try:
             self.init_event_loop()
@@ -193,7 +202,7 @@ class View:
                 curr_tile = self.__board.get_tile(
                     self.__top_left_x + j, self.__top_left_y + i
                 )
-                if curr_tile != 0:
+                if curr_tile is not None:
                     if curr_tile == self.__selected_board_tile:
                         border_color = (255, 0, 255)
                         self.draw_hollow_rect(
@@ -293,19 +302,21 @@ class View:
         black_color = (0, 0, 0)
         pygame.font.init()
         font = pygame.font.SysFont("Arial", 15)
-        server_ip = self.__socket.address
-        server_port = self.__socket.port
-        con_surface = font.render("Connected: ", True, connected_color)
-        ip_str = str(server_ip) + ":" + str(server_port)
+        if self.__socket is not None:
+            con_surface = font.render("Connected: ", True, connected_color)
+            ip_str = str(self.__socket.address) + ":" + str(self.__socket.port)
+        else:
+            con_surface = font.render("Offline", True, black_color)
+            ip_str = ""
         ip_surface = font.render(ip_str, True, black_color)
 
         score = self.__logic.player.score
         score_surface = font.render("Score: " + str(score), True, black_color)
-        pygame.draw.rect(screen, (255, 255, 255), pygame.Rect(0, 0, 995, 35))
+        pygame.draw.rect(self.__screen, (255, 255, 255), pygame.Rect(0, 0, 995, 35))
 
-        screen.blit(score_surface, (90, 17))
-        screen.blit(con_surface, (715, 14))
-        screen.blit(ip_surface, (795, 14))
+        self.__screen.blit(score_surface, (90, 17))
+        self.__screen.blit(con_surface, (715, 14))
+        self.__screen.blit(ip_surface, (795, 14))
         pygame.display.flip()
 
     def draw_hollow_rect(
@@ -360,22 +371,26 @@ class View:
                         self.__socket.close()
                         sys.exit()
                 if ev.type == DataReceivedEvent.EVENTTYPE:
-                    # TODO: Use data from event to update internal data
+                    response: ServerResponse = ev.response
                     self.__logic.is_curr_turn = (
-                        ServerResponse.ResponseFlag.START_TURN in ev.dict["flag"]
+                        ServerResponse.ResponseFlag.START_TURN in response.flag
                     )
                     self.__logic.is_first_turn = (
-                        ServerResponse.ResponseFlag.FIRST in ev.dict["flag"]
-                    )
-                    self.__board = ev.dict["curr_board"]
-                    for i in range(len(ev.dict["curr_hand"])):
-                        self.__logic.player[i] = ev.dict["curr_hand"][i]
-                    self.__logic.player.score = ev.dict["scores"][ev.dict["user_id"]]
-                    running = (
-                        ServerResponse.ResponseFlag.GAME_OVER not in ev.dict["flag"]
+                        ServerResponse.ResponseFlag.FIRST in response.flag
                     )
+                    # Temporary placements go on a fork, so the server's board
+                    # stays intact
+                    if not self.__logic.update_board(
+                        response.curr_board, response.delta
+                    ):
+                        self.__logic.request_resync(self.__socket)
+                    self.__board = self.__logic.board.fork()
+                    for i, tile in enumerate(response.curr_hand):
+                        self.__logic.player[i] = tile
+                    self.__logic.player.score = response.curr_score
+                    running = ServerResponse.ResponseFlag.GAME_OVER not in response.flag
                     self.__is_winner = (
-                        ServerResponse.ResponseFlag.WINNER in ev.dict["flag"]
+                        ServerResponse.ResponseFlag.WINNER in response.flag
                     )
                     self.update_view()
                 if ev.type == GameEndEvent.EVENTTYPE:
@@ -423,8 +438,9 @@ class View:
                         )
                     ):  # Confirm move
                         if self.__logic.tile_played() == False:  # Remove tiles
-                            self.__discarding_tiles.clear()
-                            self.__logic.end_turn(True, self.__socket)
+                            # Kept selected if the request could not be sent
+                            if self.__logic.end_turn(True, self.__socket):
+                                self.__discarding_tiles.clear()
                         else:  # Play tiles
                             self.__logic.end_turn(False, self.__socket)
                     if (100 < x < 685) and (
@@ -439,7 +455,7 @@ class View:
                                     self.__selected_tile = i
 
                                     if (
-                                        self.__selected_board_tile != 0
+                                        self.__selected_board_tile is not None
                                         and self.__logic.player[i] == None
                                         and self.__selected_board_x_y[0] != -1
                                     ):
@@ -502,7 +518,7 @@ class View:
                                                 self.__selected_board_x_y[0],
                                                 self.__selected_board_x_y[1],
                                             )
-                                            != 0
+                                            is not None
                                         ) and self.__board.get_tile(
                                             self.__selected_board_x_y[0],
                                             self.__selected_board_x_y[1],
@@ -525,7 +541,7 @@ class View:
                                                     self.__selected_board_x_y[0],
                                                     self.__selected_board_x_y[1],
                                                 )
-                                                == 0
+                                                is None
                                             )
                                         ):
                                             self.__board.add_tile(placement)
@@ -543,8 +559,9 @@ class View:
 
 
 # Driver code
-pygame.init()
-size = 1000, 800
-screen = pygame.display.set_mode(size)
-game_logic = Logic()
-View(size, game_logic)
+if __name__ == "__main__":
+    pygame.init()
+    size = 1000, 800
+    screen = pygame.display.set_mode(size)
+    game_logic = Logic()
+    View(size, game_logic)